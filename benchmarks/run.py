@@ -0,0 +1,165 @@
+"""Benchmark resolution throughput (interpreted and with `codegen=True`), App construction time and memory usage.
+
+Run from the repository root:
+
+    python -m benchmarks.run                      # print the measurements
+    python -m benchmarks.run --check              # compare against benchmarks/baseline.json, fail on regressions
+    python -m benchmarks.run --save               # overwrite the baseline with the current measurements
+
+Absolute numbers depend on the machine, so the stored baseline should be regenerated with `--save` on the machine
+running `--check`.
+"""
+
+import argparse
+import gc
+import json
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from injectionkit import App
+from injectionkit.reflect import signature_cache, signatureof
+
+from .scenarios import SCENARIOS, Scenario
+
+BASELINE = Path(__file__).with_name("baseline.json")
+
+
+@dataclass(frozen=True)
+class Measurement(object):
+    """Measurements of a single scenario.
+
+    Attributes:
+        construction_ms: Time to build the `App`, registering every option.
+        first_resolution_ms: Time of the first resolution, which compiles the dependency graph.
+        resolutions_per_second: Throughput of later resolutions.
+        generated_resolutions_per_second: Throughput of later resolutions with `codegen=True`.
+        peak_memory_kib: Peak memory allocated while building the `App` and resolving once.
+    """
+
+    construction_ms: float
+    first_resolution_ms: float
+    resolutions_per_second: float
+    generated_resolutions_per_second: float
+    peak_memory_kib: float
+
+
+# Whether a larger value is better, for each measurement.
+HIGHER_IS_BETTER = {
+    "construction_ms": False,
+    "first_resolution_ms": False,
+    "resolutions_per_second": True,
+    "generated_resolutions_per_second": True,
+    "peak_memory_kib": False,
+}
+
+
+def measure(scenario: Scenario, duration: float) -> Measurement:
+    """Measure a scenario, running warm resolutions for about `duration` seconds."""
+    options = scenario.options()
+    signature_cache.clear()
+    _ = gc.collect()
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    app = App(*options)
+    constructed = time.perf_counter()
+    _ = app.resolve(scenario.target)
+    resolved = time.perf_counter()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    generated = App(*options, codegen=True)
+    _ = generated.resolve(scenario.target)
+    return Measurement(
+        construction_ms=(constructed - started) * 1000,
+        first_resolution_ms=(resolved - constructed) * 1000,
+        resolutions_per_second=throughput(app, scenario.target, duration),
+        generated_resolutions_per_second=throughput(generated, scenario.target, duration),
+        peak_memory_kib=peak / 1024,
+    )
+
+
+def throughput(app: App, target: object, duration: float) -> float:
+    """Measure the number of resolutions of `target` per second, for about `duration` seconds."""
+    count = 0
+    started = time.perf_counter()
+    deadline = started + duration
+    while True:
+        _ = app.resolve(target)
+        count += 1
+        if time.perf_counter() >= deadline:
+            break
+    return count / (time.perf_counter() - started)
+
+
+def measure_reflection(duration: float) -> float:
+    """Measure the number of cached `signatureof` calls per second."""
+
+    def factory(first: int, second: str, third: list[float]) -> bytes:
+        return b""
+
+    count = 0
+    started = time.perf_counter()
+    deadline = started + duration
+    while time.perf_counter() < deadline:
+        for _ in range(100):
+            _ = signatureof(factory)
+        count += 100
+    return count / (time.perf_counter() - started)
+
+
+def compare(current: dict[str, dict[str, float]], baseline: dict[str, dict[str, float]], tolerance: float) -> list[str]:
+    """List the measurements that regressed by more than `tolerance` (a ratio) compared to the baseline."""
+    regressions: list[str] = []
+    for scenario, measurements in baseline.items():
+        for key, expected in measurements.items():
+            actual = current.get(scenario, {}).get(key)
+            if actual is None:
+                continue
+            if HIGHER_IS_BETTER.get(key, True):
+                regressed = actual < expected * (1 - tolerance)
+            else:
+                regressed = actual > expected * (1 + tolerance)
+            if regressed:
+                regressions.append(f"{scenario}.{key}: {actual:.2f} (baseline {expected:.2f})")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    _ = parser.add_argument("--duration", type=float, default=0.5, help="seconds of warm resolutions per scenario")
+    _ = parser.add_argument("--check", action="store_true", help="fail if a measurement regressed from the baseline")
+    _ = parser.add_argument("--save", action="store_true", help="store the measurements as the new baseline")
+    _ = parser.add_argument("--tolerance", type=float, default=0.5, help="allowed regression ratio for --check")
+    _ = parser.add_argument("--baseline", type=Path, default=BASELINE, help="baseline file")
+    arguments = parser.parse_args()
+
+    results: dict[str, dict[str, float]] = {}
+    print(f"{'scenario':<20}{'construct ms':>14}{'first ms':>12}{'resolve/s':>14}{'generated/s':>14}{'peak KiB':>12}")
+    for scenario in SCENARIOS:
+        measurement = measure(scenario, arguments.duration)
+        results[scenario.name] = {key: round(value, 2) for key, value in asdict(measurement).items()}
+        print(
+            f"{scenario.name:<20}{measurement.construction_ms:>14.2f}{measurement.first_resolution_ms:>12.2f}"
+            f"{measurement.resolutions_per_second:>14.0f}{measurement.generated_resolutions_per_second:>14.0f}"
+            f"{measurement.peak_memory_kib:>12.0f}"
+        )
+    results["reflection"] = {"signatures_per_second": round(measure_reflection(arguments.duration), 2)}
+    print(f"{'reflection':<20}{results['reflection']['signatures_per_second']:>54.0f} signatureof/s")
+
+    if arguments.save:
+        _ = arguments.baseline.write_text(json.dumps(results, indent=2) + "\n")
+    if arguments.check:
+        baseline = json.loads(arguments.baseline.read_text())
+        regressions = compare(results, baseline, arguments.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,132 @@
+"""Synthetic dependency graphs used by the benchmarks.
+
+Every scenario builds the options of an `App` from dynamically created types and factories, and names the annotation
+whose resolution is measured.
+"""
+
+import inspect
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+from typing import Annotated
+
+from injectionkit import Option, Provider, Supplier
+
+__all__ = ["Scenario", "SCENARIOS"]
+
+
+@dataclass(frozen=True)
+class Scenario(object):
+    """A benchmarked dependency graph.
+
+    Attributes:
+        name: Identifier of the scenario in reports and baselines.
+        options: Builds the options registered into the measured `App`.
+        target: Annotation resolved by the benchmark.
+    """
+
+    name: str
+    options: Callable[[], list[Option]]
+    target: object
+
+
+def _type(name: str) -> type:
+    return type(name, (object,), {})
+
+
+def _factory(name: str, returns: type, parameters: Mapping[str, object]) -> Callable[..., object]:
+    """Create a factory declaring `parameters` and returning a fresh instance of `returns`."""
+
+    def factory(*args: object, **kwargs: object) -> object:
+        return returns()
+
+    factory.__name__ = factory.__qualname__ = name
+    factory.__signature__ = inspect.Signature(  # type: ignore[attr-defined]
+        [
+            inspect.Parameter(parameter, inspect.Parameter.POSITIONAL_OR_KEYWORD, annotation=annotation)
+            for parameter, annotation in parameters.items()
+        ],
+        return_annotation=returns,
+    )
+    return factory
+
+
+def wide(width: int) -> Scenario:
+    """A root depending on `width` independent providers."""
+    leaves = [_type(f"Leaf{index}") for index in range(width)]
+    root = _type("Root")
+
+    def options() -> list[Option]:
+        result: list[Option] = [Provider(_factory(f"leaf{index}", leaf, {})) for index, leaf in enumerate(leaves)]
+        result.append(Provider(_factory("root", root, {f"p{index}": leaf for index, leaf in enumerate(leaves)})))
+        return result
+
+    return Scenario(f"wide-{width}", options, root)
+
+
+def deep(depth: int) -> Scenario:
+    """A chain of `depth` providers, each depending on the previous one."""
+    links = [_type(f"Link{index}") for index in range(depth)]
+
+    def options() -> list[Option]:
+        result: list[Option] = [Provider(_factory("link0", links[0], {}))]
+        for index in range(1, depth):
+            result.append(Provider(_factory(f"link{index}", links[index], {"previous": links[index - 1]})))
+        return result
+
+    return Scenario(f"deep-{depth}", options, links[-1])
+
+
+def diamonds(count: int) -> Scenario:
+    """A chain of `count` diamonds of transient providers: every diamond doubles the number of builds."""
+    tops = [_type(f"Top{index}") for index in range(count + 1)]
+    lefts = [_type(f"Left{index}") for index in range(count)]
+    rights = [_type(f"Right{index}") for index in range(count)]
+
+    def options() -> list[Option]:
+        result: list[Option] = [Provider(_factory("top0", tops[0], {}))]
+        for index in range(count):
+            result.append(Provider(_factory(f"left{index}", lefts[index], {"top": tops[index]})))
+            result.append(Provider(_factory(f"right{index}", rights[index], {"top": tops[index]})))
+            parameters = {"left": lefts[index], "right": rights[index]}
+            result.append(Provider(_factory(f"top{index + 1}", tops[index + 1], parameters)))
+        return result
+
+    return Scenario(f"diamonds-{count}", options, tops[-1])
+
+
+def labels(count: int) -> Scenario:
+    """`count` labeled `str` configuration values, resolved through a consumer-like provider with label filters."""
+    root = _type("Settings")
+
+    def options() -> list[Option]:
+        result: list[Option] = []
+        for index in range(count):
+            annotation = Annotated[str, f"key{index}", f"group{index % 10}", "config"]
+            result.append(Supplier(f"value{index}", regard=annotation))
+        parameters: dict[str, object] = {f"key{index}": Annotated[str, f"key{index}"] for index in range(0, count, 10)}
+        parameters["group"] = Annotated[list[str], "group0", "config"]
+        result.append(Provider(_factory("settings", root, parameters)))
+        return result
+
+    return Scenario(f"labels-{count}", options, root)
+
+
+def multivalues(count: int) -> Scenario:
+    """`count` suppliers and `count` providers of the same type, resolved as a `list[T]`."""
+    plugin = _type("Plugin")
+
+    def options() -> list[Option]:
+        result: list[Option] = [Supplier(plugin()) for _ in range(count)]
+        result.extend(Provider(_factory(f"plugin{index}", plugin, {})) for index in range(count))
+        return result
+
+    return Scenario(f"multivalues-{count}", options, list[plugin])  # type: ignore[valid-type]
+
+
+SCENARIOS: list[Scenario] = [
+    wide(200),
+    deep(200),
+    diamonds(8),
+    labels(500),
+    multivalues(200),
+]
@@ -1,3 +1,9 @@
 from ._app import *  # noqa: F403
 from ._container import *  # noqa: F403
+from ._graph import *  # noqa: F403
+from ._lazy import *  # noqa: F403
 from ._option import *  # noqa: F403
+from ._plan import *  # noqa: F403
+from ._profile import *  # noqa: F403
+from ._registry import *  # noqa: F403
+from ._trace import *  # noqa: F403
@@ -1,40 +1,47 @@
+import os
+from collections.abc import Iterable
+from concurrent.futures import Executor, Future
 from typing import final
 
-from ._container import DependencyContainer, Instantiator, MissingDependencyError
-from ._option import Consumer, Option, Supplier
-from .reflect import Unspecified, signatureof
+from ._container import DependencyContainer, FrozenContainerError
+from ._option import Consumer, Option, Provider, Supplier
+from ._profile import StartupProfiler, StartupReport
+from ._registry import RegistryCache
+from ._trace import Hook
 
-__all__ = ["App", "runApp"]
+__all__ = ["App", "AsyncApp", "runApp"]
 
 
-@final
-class App(object):
-    """Coordinate dependency options with consumer execution.
-
-    The application builds a dependency graph from the supplied options, keeps track of registered consumers, and
-    resolves their inputs when `run` executes.
-    """
+class _Application(object):
+    """Registration logic shared by `App` and `AsyncApp`."""
 
     _container: DependencyContainer
     _consumers: list[Consumer]
+    _registry: RegistryCache | None
+    _profiler: StartupProfiler | None
 
-    def __init__(self, *options: Option) -> None:
-        """Populate the application with the provided dependency options.
-
-        The constructor processes each option immediately, registering providers or suppliers and remembering consumers
-        for later execution.
-
-        Args:
-            *options: Provider, supplier, or consumer instances that describe how dependencies should be built or
-                consumed.
-
-        Returns:
-            None
-        """
-        self._container = DependencyContainer()
+    def __init__(
+        self,
+        container: DependencyContainer,
+        *options: Option,
+        validate: bool,
+        hooks: Iterable[Hook],
+        registry_cache: str | os.PathLike[str] | None,
+        profile: bool,
+    ) -> None:
+        self._container = container
         self._consumers = []
+        self._registry = None if registry_cache is None else RegistryCache(registry_cache)
+        self._profiler = None
+        if profile:
+            self._profiler = StartupProfiler()
+            self.add_hook(self._profiler)
+        for hook in hooks:
+            self.add_hook(hook)
         self.add(Supplier(self))
         self.add(*options)
+        if validate:
+            _ = self.validate()
 
     def add(self, *options: Option) -> None:
         """Register additional dependency options after initialization.
@@ -47,12 +54,193 @@ class App(object):
 
         Returns:
             None
+
+        Raises:
+            FrozenContainerError: If the application is frozen.
         """
         for option in options:
+            if self._container.frozen:
+                raise FrozenContainerError(option)
+            # Signatures found in the registry cache are not reflected again. Factories given as import paths are only
+            # reflected once imported, and suppliers are not reflected at all.
+            target: object = None
+            if isinstance(option, Consumer):
+                target = option.functor
+            elif isinstance(option, Provider) and not isinstance(option.factory, str):
+                target = option.factory
+            cached = self._registry is not None and target is not None and self._registry.preload(target)
             if isinstance(option, Consumer):
                 self._consumers.append(option)
             else:
                 self._container.register(option)
+            if self._registry is not None and target is not None and not cached:
+                self._registry.record(target)
+        if self._registry is not None:
+            self._registry.save()
+
+    def close(self) -> None:
+        """Tear down managed instances, then release the registrations, consumers and cached instances.
+
+        Instances built by generator and context manager providers are torn down in reverse topological order: each
+        one before the instances it depends on. With an executor, independent branches of the graph are torn down in
+        parallel. Afterwards, the options and the instances they built can be garbage-collected, even while the
+        application itself is still referenced.
+
+        Returns:
+            None
+        """
+        self._consumers.clear()
+        self._container.close()
+
+    def scope(self, *options: Provider | Supplier) -> DependencyContainer:
+        """Create a scope, e.g. for a request, in constant time.
+
+        The scope sees every option of the application, holds its own `Lifetime.scoped` instances, and registers the
+        given options for itself only (e.g. the request being handled). While the scope is entered with `with`, in the
+        current thread or asyncio task (and the tasks it creates), `resolve` and `run` go through the scope:
+
+            with app.scope(Supplier(request)):
+                handler = app.resolve(Handler)
+
+        Args:
+            *options: Providers and suppliers only visible inside the scope.
+
+        Returns:
+            The scope, a child of the application container.
+        """
+        scope = self._container.child()
+        for option in options:
+            scope.register(option)
+        return scope
+
+    def freeze(self) -> None:
+        """Seal the application, rejecting further options and precomputing every dependency graph.
+
+        After freezing, `add` raises `FrozenContainerError`. A frozen application can be shared by many threads, which
+        then resolve dependencies by reading immutable lookup tables, without taking any lock (apart from building a
+        singleton or scoped instance the first time).
+
+        Returns:
+            None
+        """
+        self._container.freeze(consumer.functor for consumer in self._consumers)
+
+    @property
+    def frozen(self) -> bool:
+        """Whether the application has been frozen."""
+        return self._container.frozen
+
+    def add_hook(self, hook: Hook) -> None:
+        """Install a tracing hook, called with a `TraceEvent` whenever a traced step begins or ends.
+
+        Reflecting options, compiling plans, calling provider factories and calling consumers are traced. Pass
+        `ChromeTraceExporter()` to record a trace that can be opened in Perfetto.
+
+        Args:
+            hook: Callback receiving every trace event.
+
+        Returns:
+            None
+        """
+        self._container.add_hook(hook)
+
+    def remove_hook(self, hook: Hook) -> None:
+        """Uninstall a hook installed with `add_hook` or passed to the constructor.
+
+        Args:
+            hook: The installed hook.
+
+        Returns:
+            None
+
+        Raises:
+            ValueError: If the hook is not installed.
+        """
+        self._container.remove_hook(hook)
+
+    def validate(self) -> list[Provider]:
+        """Check that every provider and consumer can be resolved, without building anything.
+
+        Returns:
+            The registered providers in a topological build order, dependencies first.
+
+        Raises:
+            InvalidProviderFactoryError: If a provider factory is not callable, or cannot be imported.
+            MissingDependencyError: If a dependency without default value is not registered.
+            CircularDependencyError: If providers depend on each other in a cycle.
+        """
+        return self._container.validate(consumer.functor for consumer in self._consumers)
+
+    def startup_report(self) -> StartupReport:
+        """Report which chain of providers bounds the startup time, for an application created with `profile=True`.
+
+        Every provider built so far is reported with the time spent in its factory (self time), the time spent building
+        it along with all of its dependencies (inclusive time) and its dependencies, and the critical path is the chain
+        of dependencies taking the longest. Write the report with `write_json`, or with `write_dot` to render it with
+        Graphviz:
+
+            app = App(*options, profile=True)
+            app.run()
+            app.startup_report().write_dot("startup.dot")
+
+        Returns:
+            The dependency graph of the built providers, annotated with their build times.
+
+        Raises:
+            RuntimeError: If the application is not profiled.
+        """
+        if self._profiler is None:
+            raise RuntimeError("Startup is only profiled for applications created with profile=True")
+        return self._profiler.report(self._container.dependencies)
+
+
+@final
+class App(_Application):
+    """Coordinate dependency options with consumer execution.
+
+    The application builds a dependency graph from the supplied options, keeps track of registered consumers, and
+    resolves their inputs when `run` executes.
+    """
+
+    def __init__(
+        self,
+        *options: Option,
+        executor: Executor | None = None,
+        validate: bool = False,
+        hooks: Iterable[Hook] = (),
+        codegen: bool = False,
+        registry_cache: str | os.PathLike[str] | None = None,
+        subtypes: bool = False,
+        profile: bool = False,
+    ) -> None:
+        """Populate the application with the provided dependency options.
+
+        The constructor processes each option immediately, registering providers or suppliers and remembering consumers
+        for later execution.
+
+        Args:
+            *options: Provider, supplier, or consumer instances that describe how dependencies should be built or
+                consumed.
+            executor: Optional executor (e.g. a `ThreadPoolExecutor`) on which independent providers are built in
+                parallel.
+            validate: Whether to `validate` the dependency graph right away.
+            hooks: Tracing hooks installed before registering the options, see `add_hook`.
+            codegen: Whether to resolve dependencies with Python code generated for every dependency graph, calling
+                providers directly instead of interpreting the graph. Generating the code makes the first resolution
+                slower, and the later ones faster.
+            registry_cache: Optional cache file of reflected signatures (see `RegistryCache`), loaded instead of
+                reflecting unchanged factories and consumers again, and updated with the others.
+            subtypes: Whether a class (or ABC) without registrations of its own resolves to the registrations of its
+                subclasses (virtual ones included). Exact registrations always take precedence.
+            profile: Whether to record how long every provider takes to build, see `startup_report`.
+
+        Returns:
+            None
+        """
+        container = DependencyContainer(executor=executor, codegen=codegen, subtypes=subtypes)
+        super().__init__(
+            container, *options, validate=validate, hooks=hooks, registry_cache=registry_cache, profile=profile
+        )
 
     def resolve(self, annotation: object) -> object:
         """
@@ -61,13 +249,141 @@ class App(object):
         Args:
             annotation: The dependency annotation to resolve.
         """
-        return self._container.resolve(annotation)
+        return self._container.active().resolve(annotation)
+
+    def warmup(self) -> None:
+        """Build every fork-safe singleton up front, e.g. in the master process of a pre-fork server.
+
+        Forked workers share these singletons copy-on-write. Singletons of providers marked `fork_safe=False` (e.g.
+        holding sockets or threads), and the instances built from them, are dropped in forked processes and rebuilt
+        there on first use.
+
+        Returns:
+            None
+        """
+        self._container.warmup()
+
+    def start_warmup(self, *annotations: object, executor: Executor | None = None) -> Future[None]:
+        """Build singletons in the background, each after its dependencies, while the application already serves.
+
+        Resolutions do not wait for the warm-up to complete: a singleton that is already built is used right away, and
+        one that is not is built on demand, unless the warm-up is building it at that moment, in which case the
+        resolution only waits for that singleton:
+
+            ready = app.start_warmup()
+            serve(health=lambda: ready.done())
+
+        Args:
+            *annotations: Type annotations whose singletons are built; every singleton is built if none is given.
+            executor: Executor running the warm-up instead of a dedicated daemon thread. It should not be the executor
+                of the application, on which the warm-up waits for independent singletons built in parallel.
+
+        Returns:
+            Future completed once every singleton is built, or holding the error that stopped the warm-up.
+        """
+        return self._container.start_warmup(*annotations, executor=executor)
+
+    def resolve_many(self, *annotations: object) -> list[object]:
+        """Resolve several dependencies in a single session, e.g. at the start of a request.
+
+        Dependencies shared by the annotations are built once for the whole batch, transient ones included, and the
+        dependency graph of the batch is memoized, so resolving the same annotations again only executes it.
+
+        Args:
+            *annotations: The dependency annotations to resolve.
+
+        Returns:
+            The resolved dependencies, in the order of the annotations.
+        """
+        return self._container.active().resolve_many(*annotations)
+
+    def __enter__(self) -> "App":
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self.close()
 
     def run(self) -> None:
         """Resolve dependencies and invoke every registered consumer.
 
         For each consumer the application determines required inputs, initializes them from registered dependencies or
-        defaults, injects the resulting values, and finally executes the callable.
+        defaults, injects the resulting values, and finally executes the callable. Consumers are compiled into plans by
+        the container, so running them again does not reflect their signatures a second time.
+
+        Returns:
+            None
+
+        Raises:
+            MissingDependencyError: If a consumer requires a dependency that is not registered and lacks a default
+                value.
+        """
+        container = self._container.active()
+        for consumer in self._consumers:
+            _ = container.invoke(consumer.functor)
+
+
+@final
+class AsyncApp(_Application):
+    """Asynchronous counterpart of `App`.
+
+    Providers and consumers may be coroutine functions. Independent branches of the dependency graph are resolved
+    concurrently, while consumers are still awaited one after another, in the order they were added.
+    """
+
+    def __init__(
+        self,
+        *options: Option,
+        validate: bool = False,
+        hooks: Iterable[Hook] = (),
+        registry_cache: str | os.PathLike[str] | None = None,
+        subtypes: bool = False,
+        profile: bool = False,
+    ) -> None:
+        """Populate the application with the provided dependency options.
+
+        Args:
+            *options: Provider, supplier, or consumer instances that describe how dependencies should be built or
+                consumed. Factories and consumers may be coroutine functions.
+            validate: Whether to `validate` the dependency graph right away.
+            hooks: Tracing hooks installed before registering the options, see `add_hook`.
+            registry_cache: Optional cache file of reflected signatures, see `App`.
+            subtypes: Whether classes resolve to the registrations of their subclasses, see `App`.
+            profile: Whether to record how long every provider takes to build, see `startup_report`.
+
+        Returns:
+            None
+        """
+        container = DependencyContainer(subtypes=subtypes)
+        super().__init__(
+            container, *options, validate=validate, hooks=hooks, registry_cache=registry_cache, profile=profile
+        )
+
+    async def resolve(self, annotation: object) -> object:
+        """
+        Resolves a dependency asynchronously.
+
+        Args:
+            annotation: The dependency annotation to resolve.
+        """
+        return await self._container.active().resolve_async(annotation)
+
+    async def aclose(self) -> None:
+        """Asynchronous counterpart of `close`, tearing independent branches down concurrently.
+
+        Returns:
+            None
+        """
+        self._consumers.clear()
+        await self._container.aclose()
+
+    async def __aenter__(self) -> "AsyncApp":
+        return self
+
+    async def __aexit__(self, *_: object) -> None:
+        await self.aclose()
+
+    async def run(self) -> None:
+        """Resolve dependencies and invoke (and await) every registered consumer.
 
         Returns:
             None
@@ -76,29 +392,9 @@ class App(object):
             MissingDependencyError: If a consumer requires a dependency that is not registered and lacks a default
                 value.
         """
+        container = self._container.active()
         for consumer in self._consumers:
-            signature = signatureof(consumer.functor)
-            instantiator = Instantiator(consumer.functor)
-            for parameter in signature.parameters:
-                try:
-                    argument = self._container.instantiate(parameter.typ.concrete, parameter.typ.labels)
-                    instantiator.argument(parameter.name, argument)
-                except MissingDependencyError:
-                    # Skip it if a default value is provided
-                    if parameter.default_value is not Unspecified:
-                        continue
-                    raise
-                    # # If it's not a list, then this is indeed a missing dependency.
-                    # if parameter.typ.concrete.constructor is not list:
-                    #     raise
-
-                    # # Or, if it's a list, try to instantiate its inner type and returns them or it as a list
-                    # inner_type = parameter.typ.concrete.parameters[0]
-                    # argument = self._container.instantiate(inner_type, parameter.typ.labels)
-                    # if not isinstance(argument, list):
-                    #     raise  # No MULTIPLE values found.
-                    # instantiator.argument(parameter.name, argument)
-            _ = instantiator.instantiate()
+            _ = await container.invoke_async(consumer.functor)
 
 
 def runApp(*options: Option) -> None:
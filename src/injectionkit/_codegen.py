@@ -0,0 +1,83 @@
+from ._graph import Generated, Graph, Selection
+from ._option import Lifetime
+
+__all__ = ["generate"]
+
+
+def generate(graph: Graph, cached: frozenset[int]) -> Generated:
+    """Generate straight-line Python code executing a graph, and compile it with `exec`.
+
+    The code is specialized for a set of cached nodes, i.e. the singleton and scoped instances that are already built:
+    they are read from their cache, and the nodes only they depend on are left out, exactly like `_execute` prunes the
+    graph at runtime. Every other provider is called directly, with its arguments as literal positional and keyword
+    arguments, so there is no loop over nodes, no argument list and no keyword dict left to build at runtime.
+
+    Args:
+        graph: The graph to execute.
+        cached: Indices of the shared nodes whose instances are cached.
+
+    Returns:
+        Function executing the graph and returning the values of its roots.
+    """
+    namespace: dict[str, object] = {}
+    statements: dict[int, str] = {}
+    expressions: dict[int, str] = {}
+
+    def selection(name: str, argument: Selection) -> str:
+        if not argument.nodes:
+            namespace[name] = argument.default
+            return name
+        if len(argument.nodes) == 1:
+            return expressions[argument.nodes[0]]
+        return f"[{', '.join(expressions[node] for node in argument.nodes)}]"
+
+    needed = {node for root in graph.roots for node in root.nodes}
+    pending: list[int] = []
+    for index in range(len(graph.nodes) - 1, -1, -1):
+        if index not in needed:
+            continue
+        node = graph.nodes[index]
+        if node.deferred is not None:
+            namespace[f"d{index}"] = node.deferred
+            statements[index] = f"v{index} = defer(*d{index})"
+            expressions[index] = f"v{index}"
+        elif node.provider is None:
+            namespace[f"i{index}"] = node.instance
+            expressions[index] = f"i{index}"
+        else:
+            namespace[f"p{index}"] = node.provider
+            cache = "singletons" if node.provider.lifetime is Lifetime.singleton else "scoped"
+            expressions[index] = f"v{index}"
+            if index in cached:
+                statements[index] = f"v{index} = {cache}.instances[p{index}]"
+            else:
+                pending.append(index)
+                needed |= node.dependencies
+
+    for index in reversed(pending):
+        node = graph.nodes[index]
+        assert node.provider is not None and node.plan is not None
+        plan = node.plan
+        values = [selection(f"k{index}_{position}", argument) for position, argument in enumerate(node.arguments)]
+        count = len(plan.positional)
+        if plan.asynchronous:
+            # `Plan.invoke` raises `AsyncResolutionError`, at the same point as the interpreted execution.
+            namespace[f"f{index}"] = plan.invoke
+            call = f"f{index}([{', '.join(values)}])"
+        else:
+            namespace[f"f{index}"] = plan.target
+            keywords = [f"{slot.name}={value}" for slot, value in zip(plan.keyword, values[count:])]
+            call = f"f{index}({', '.join(values[:count] + keywords)})"
+        if node.provider.lifetime is Lifetime.transient:
+            statements[index] = f"v{index} = {call}"
+        else:
+            cache = "singletons" if node.provider.lifetime is Lifetime.singleton else "scoped"
+            statements[index] = f"v{index} = {cache}.get_or_build(p{index}, lambda: {call})"
+
+    roots = [selection(f"r{position}", root) for position, root in enumerate(graph.roots)]
+    lines = ["def execute(singletons, scoped, defer):"]
+    lines.extend(f"    {statements[index]}" for index in sorted(statements))
+    lines.append(f"    return [{', '.join(roots)}]")
+    exec(compile("\n".join(lines), "<injectionkit generated graph>", "exec"), namespace)
+    execute: Generated = namespace["execute"]  # type: ignore[assignment]
+    return execute
@@ -1,10 +1,83 @@
-from collections.abc import Callable, Iterable
-from typing import Generic, TypeVar, final
+import asyncio
+import os
+import threading
+import time
+import weakref
+from abc import ABCMeta
+from contextvars import ContextVar, Token
+from collections.abc import AsyncIterable, AsyncIterator, Awaitable, Callable, Generator, Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, wait
+from dataclasses import dataclass
+from functools import partial
+from typing import Any, TypeAlias, TypeVar, final
 
-from ._option import InvalidProviderFactoryError, Provider, Supplier
-from .reflect import ConcreteType, Parameter, ParameterKind, Unspecified, signatureof, typeof
+from ._codegen import generate
+from ._generic import annotation, generic, unify
+from ._graph import CircularDependencyError, Graph, Node, Selection
+from ._index import LabelIndex
+from ._lazy import Lazy
+from ._managed import UNMANAGED, Exit, Reached, tear_down, tear_down_async
+from ._option import InvalidProviderFactoryError, Lifetime, Provider, Supplier
+from ._plan import Binding, Plan, Slot
+from ._trace import Hook, TraceEvent, TraceKind, TracePhase, nameof, spans
+from .reflect import (
+    ComplicatedSignatureError,
+    ConcreteType,
+    InvalidAnnotatedTypeError,
+    InvalidLabelTypeError,
+    Parameter,
+    ParameterKind,
+    UnreflectableTypeError,
+    Unspecified,
+    signatureof,
+    typeof,
+)
 
-__all__ = ["Instantiator", "MissingDependencyError", "DependencyContainer"]
+__all__ = [
+    "Instantiator",
+    "MissingDependencyError",
+    "FrozenContainerError",
+    "ScopeRequiredError",
+    "DependencyContainer",
+]
+
+_R = TypeVar("_R")
+
+
+_worker = threading.local()
+"""Marks the executor threads building providers, see `_work`."""
+
+
+def _work(build: Callable[..., _R], *arguments: object) -> _R:
+    """Run a build on an executor thread, marking the thread while it runs.
+
+    Resolutions nested in the build (e.g. `Lazy.get` or a stream consumed by a factory) then build inline: waiting for
+    the executor from one of its own threads deadlocks once every thread waits.
+    """
+    nested = getattr(_worker, "active", False)
+    _worker.active = True
+    try:
+        return build(*arguments)
+    finally:
+        _worker.active = nested
+
+
+def _listed(concrete: ConcreteType) -> ConcreteType | None:
+    """Return `T` for `list[T]`, otherwise `None`."""
+    if concrete.constructor is list and len(concrete.parameters) == 1:
+        return concrete.parameters[0]
+    return None
+
+
+def _subclass(derived: object, base: type) -> bool:
+    try:
+        return isinstance(derived, type) and issubclass(derived, base)
+    except TypeError:
+        return False
+
+
+_STREAMS: set[object] = {Iterator, Iterable}
+_ASYNC_STREAMS: set[object] = {AsyncIterator, AsyncIterable}
 
 
 class Instantiator(object):
@@ -94,23 +167,6 @@ class Instantiator(object):
         return self._factory(*args, **kwargs)
 
 
-_T = TypeVar("_T")
-
-
-class _Labeled(Generic[_T]):
-    value: _T
-    labels: set[str]
-
-    def __init__(self, value: _T, labels: Iterable[str]) -> None:
-        self.value = value
-        self.labels = set(labels)
-
-    def __contains__(self, labels: Iterable[str]) -> bool:
-        if not labels:
-            return not self.labels
-        return self.labels.issuperset(labels)
-
-
 class MissingDependencyError(Exception):
     """Report that dependency resolution failed for a concrete type.
 
@@ -131,51 +187,894 @@ class MissingDependencyError(Exception):
         self.labels = labels
 
 
+class FrozenContainerError(Exception):
+    """Report that an option was added to a frozen container or application.
+
+    Attributes:
+        option: The rejected option.
+    """
+
+    option: object
+
+    def __init__(self, option: object) -> None:
+        super().__init__(f"Cannot add `{option}`: the container is frozen")
+        self.option = option
+
+
+class ScopeRequiredError(Exception):
+    """Report that a managed transient instance was resolved outside of any scope.
+
+    Transient instances of generators and context managers are torn down along with the scope that built them. The
+    root container is only closed with the application, so such instances are only resolved inside a scope (see
+    `App.scope`), as dependencies of singleton and scoped instances, which bound their lifetime, or for consumers (see
+    `invoke`), whose instances are torn down when the application closes.
+
+    Attributes:
+        provider: The managed transient provider.
+    """
+
+    provider: Provider
+
+    def __init__(self, provider: Provider) -> None:
+        super().__init__(f"Resolve `{nameof(provider.factory)}` in a scope: it builds transients to tear down")
+        self.provider = provider
+
+
+@final
+class _InstanceCache(object):
+    """Instances of a single lifetime, keyed by provider.
+
+    Alongside the instances, the cache holds the per-provider locks guarding their construction across threads, and the
+    tasks of instances being built by asynchronous resolutions. It also owns the teardowns of the managed instances of
+    its lifetime (transient ones included, for the scoped cache), in construction order, and what each cached instance
+    reached.
+    """
+
+    instances: dict[Provider, object]
+    tasks: dict[Provider, "asyncio.Task[tuple[object, Reached]]"]
+    exits: list[Exit]
+    reached: dict[Provider, Reached]
+    _locks: dict[Provider, threading.RLock]
+    _guard: threading.Lock
+
+    def __init__(self) -> None:
+        self.instances = {}
+        self.tasks = {}
+        self.exits = []
+        self.reached = {}
+        self._locks = {}
+        self._guard = threading.Lock()
+
+    def get_or_build(self, provider: Provider, build: Callable[[], object]) -> object:
+        """Return the cached instance of `provider`, building it with `build` exactly once if necessary.
+
+        Cached instances are read without locking; only construction is serialized, per provider.
+
+        Args:
+            provider: Provider whose instance is requested.
+            build: Callback constructing the instance.
+
+        Returns:
+            The cached or newly built instance.
+        """
+        try:
+            return self.instances[provider]
+        except KeyError:
+            pass
+        lock = self._locks.get(provider)
+        if lock is None:
+            with self._guard:
+                lock = self._locks.setdefault(provider, threading.RLock())
+        with lock:
+            try:
+                return self.instances[provider]
+            except KeyError:
+                pass
+            instance = build()
+            self.instances[provider] = instance
+            return instance
+
+    def clear(self) -> None:
+        """Drop every instance, along with the construction locks and the teardowns."""
+        with self._guard:
+            self.instances.clear()
+            self.exits.clear()
+            self.reached.clear()
+            self._locks.clear()
+
+    def detach(self) -> list[Exit]:
+        """Take the teardowns out of the cache, in construction order."""
+        exits, self.exits = self.exits, []
+        return exits
+
+    def forked(self, stale: set[Provider]) -> None:
+        """Drop the instances of `stale` providers in a forked child process, without tearing them down.
+
+        The locks are renewed as well, since the threads holding them at the time of the fork do not exist in the
+        child.
+
+        Args:
+            stale: Providers whose instances cannot be used in the child.
+
+        Returns:
+            None
+        """
+        self._guard = threading.Lock()
+        self._locks = {}
+        self.tasks = {}
+        for provider in stale:
+            _ = self.instances.pop(provider, None)
+            _ = self.reached.pop(provider, None)
+        # The resources belong to the parent process, which tears them down itself.
+        self.exits = [teardown for teardown in self.exits if teardown.provider not in stale]
+
+
+_Frame: TypeAlias = Generator[Any, Any, Any]
+
+
+@final
+class _Expansion(object):
+    """Expand resolutions into a `Graph` of nodes in topological order.
+
+    The expansion walks the bindings of the container depth-first. Instead of recursing, every step is a generator that
+    yields the sub-steps it depends on, and `_run` drives them with an explicit stack, so deep dependency chains do not
+    exhaust the Python stack. Singleton and scoped providers are expanded once, and a provider reached again while it
+    is being expanded raises `CircularDependencyError`.
+
+    `Lazy[T]` queries are not expanded: they become deferred nodes, once `T` is known to have candidates. Since the
+    handle resolves `T` later on, a dependency through `Lazy` does not close a cycle. The same goes for `Iterator[T]`
+    (and `Iterable[T]`, `AsyncIterator[T]`, `AsyncIterable[T]`) queries without candidates of their own, answered by
+    a generator building the candidates of `T` one at a time.
+
+    A batch expansion (see `resolve_many`) is a single session: every provider is expanded once, transient ones
+    included, so the dependencies shared by the roots are built once for the whole batch.
+
+    Attributes:
+        types: Concrete types whose bindings were consulted, i.e. whose registrations invalidate the expanded graph.
+        deferred: Queries behind the deferred nodes, i.e. what the handles will resolve.
+    """
+
+    _container: "DependencyContainer"
+    _batch: bool
+    _nodes: list[Node]
+    _shared: dict[Provider, int]
+    _path: list[Provider]
+    _visiting: set[Provider]
+    types: set[ConcreteType]
+    deferred: list[tuple[ConcreteType, frozenset[str]]]
+
+    def __init__(self, container: "DependencyContainer", batch: bool = False) -> None:
+        self._container = container
+        self._batch = batch
+        self.types = set()
+        self.deferred = []
+        self._nodes = []
+        self._shared = {}
+        self._path = []
+        self._visiting = set()
+
+    def graph(self, roots: tuple[Selection, ...]) -> Graph:
+        """Return the graph expanded so far, with the given roots."""
+        shared = tuple(
+            (index, node.provider)
+            for index, node in enumerate(self._nodes)
+            if node.provider is not None and node.provider.lifetime is not Lifetime.transient
+        )
+        managed = any(node.plan is not None and node.plan.managed for node in self._nodes)
+        # Nodes whose values end up in a singleton or scoped instance, visiting dependents before their dependencies.
+        owned = [node.provider is not None and node.provider.lifetime is not Lifetime.transient for node in self._nodes]
+        for index in reversed(range(len(self._nodes))):
+            if owned[index]:
+                for dependency in self._nodes[index].dependencies:
+                    owned[dependency] = True
+        unowned: list[Provider] = []
+        for index, node in enumerate(self._nodes):
+            if node.provider is not None and node.plan is not None and node.plan.managed and not owned[index]:
+                unowned.append(node.provider)
+        return Graph(tuple(self._nodes), roots, frozenset(self.types), shared, managed, tuple(unowned))
+
+    def query(self, concrete: ConcreteType, labels: frozenset[str]) -> Selection:
+        """Expand the candidates of a (concrete type, labels) query.
+
+        Raises:
+            MissingDependencyError: If the query or one of the dependencies has no candidate.
+            CircularDependencyError: If the providers involved depend on each other in a cycle.
+        """
+        selection: Selection = self._run(self._select(concrete, labels))
+        return selection
+
+    def provider(self, provider: Provider, plan: Plan) -> int:
+        """Expand a provider along with its dependencies, returning the index of its node.
+
+        Raises:
+            MissingDependencyError: If a required argument or one of the dependencies has no candidate.
+            CircularDependencyError: If the providers involved depend on each other in a cycle.
+        """
+        index: int = self._run(self._provide(provider, plan))
+        return index
+
+    def arguments(self, plan: Plan) -> tuple[Selection, ...]:
+        """Expand the arguments of a plan, one selection per slot.
+
+        Raises:
+            MissingDependencyError: If a required argument or one of the dependencies has no candidate.
+            CircularDependencyError: If the providers involved depend on each other in a cycle.
+        """
+        arguments: tuple[Selection, ...] = self._run(self._arguments(plan))
+        return arguments
+
+    def _run(self, frame: _Frame) -> Any:
+        stack = [frame]
+        result: Any = None
+        error: BaseException | None = None
+        while True:
+            try:
+                if error is None:
+                    request = stack[-1].send(result)
+                else:
+                    thrown, error = error, None
+                    request = stack[-1].throw(thrown)
+            except StopIteration as stop:
+                _ = stack.pop()
+                if not stack:
+                    return stop.value
+                result = stop.value
+                continue
+            except Exception as exception:
+                _ = stack.pop()
+                if not stack:
+                    raise
+                result, error = None, exception
+                continue
+            stack.append(request)
+            result = None
+
+    def _select(self, concrete: ConcreteType, labels: frozenset[str]) -> _Frame:
+        if concrete.constructor is Lazy and len(concrete.parameters) == 1:
+            return self._defer(concrete, labels)
+        if self._container._streamed(concrete, labels):  # pyright: ignore[reportPrivateUsage]
+            self.types.add(concrete)
+            return self._defer(concrete, labels)
+        self.types.add(concrete)
+        binding = self._container._binding(concrete, labels)  # pyright: ignore[reportPrivateUsage]
+        if _listed(concrete) is not None:
+            # Registering a `T` changes whether `list[T]` falls back to the candidates of `T`, even without any so far.
+            self.types.add(concrete.parameters[0])
+        nodes: list[int] = []
+        for instance in binding.instances:
+            nodes.append(len(self._nodes))
+            self._nodes.append(Node(None, None, instance))
+        for provider, plan in binding.providers:
+            nodes.append((yield self._provide(provider, plan)))
+        if not nodes:
+            raise MissingDependencyError(concrete, set(labels))
+        return Selection(tuple(nodes))
+
+    def _defer(self, concrete: ConcreteType, labels: frozenset[str]) -> Selection:
+        inner = concrete.parameters[0]
+        if not self._exists(inner, labels):
+            raise MissingDependencyError(inner, set(labels))
+        self.deferred.append((inner, labels))
+        self._nodes.append(Node(None, None, deferred=(concrete, labels)))
+        return Selection((len(self._nodes) - 1,))
+
+    def _exists(self, concrete: ConcreteType, labels: frozenset[str]) -> bool:
+        self.types.add(concrete)
+        binding = self._container._binding(concrete, labels)  # pyright: ignore[reportPrivateUsage]
+        if _listed(concrete) is not None:
+            self.types.add(concrete.parameters[0])
+        return bool(binding.instances or binding.providers)
+
+    def _provide(self, provider: Provider, plan: Plan) -> _Frame:
+        shared = self._batch or provider.lifetime is not Lifetime.transient
+        if shared and provider in self._shared:
+            return self._shared[provider]
+        if provider in self._visiting:
+            raise CircularDependencyError(self._path[self._path.index(provider) :] + [provider])
+        depth = len(self._path) + 1
+        self._path.append(provider)
+        self._visiting.add(provider)
+        try:
+            arguments: tuple[Selection, ...] = yield self._arguments(plan)
+        finally:
+            self._visiting.discard(self._path.pop())
+        index = len(self._nodes)
+        self._nodes.append(Node(provider, plan, None, arguments, depth=depth))
+        if shared:
+            self._shared[provider] = index
+        return index
+
+    def _arguments(self, plan: Plan) -> _Frame:
+        arguments: list[Selection] = []
+        for slot in plan.slots:
+            try:
+                arguments.append((yield self._select(slot.concrete, slot.labels)))
+            except MissingDependencyError:
+                if slot.default is Unspecified:
+                    raise
+                arguments.append(Selection((), slot.default))
+        return tuple(arguments)
+
+
+@dataclass(frozen=True)
+class _Batch(object):
+    """Graph key of the queries resolved together by `resolve_many`."""
+
+    queries: tuple[tuple[ConcreteType, frozenset[str]], ...]
+
+
+_GraphKey: TypeAlias = "tuple[ConcreteType, frozenset[str]] | Plan | Provider | _Batch"
+
+_UNRESOLVABLE = (
+    MissingDependencyError,
+    CircularDependencyError,
+    InvalidProviderFactoryError,
+    ComplicatedSignatureError,
+    UnreflectableTypeError,
+    InvalidAnnotatedTypeError,
+    InvalidLabelTypeError,
+)
+"""Errors of the graphs that `DependencyContainer.freeze` leaves to be raised on resolution."""
+
+_active: "ContextVar[DependencyContainer | None]" = ContextVar("injectionkit.active", default=None)
+"""Scope entered with `with container:` in the current context."""
+
+
+_roots: "weakref.WeakSet[DependencyContainer]" = weakref.WeakSet()
+"""Root containers alive in this process, whose fork-unsafe instances are dropped in forked children."""
+
+
+def _after_fork_in_child() -> None:
+    for container in list(_roots):
+        container._forked()  # pyright: ignore[reportPrivateUsage]
+
+
 @final
 class DependencyContainer(object):
     """Central registry for dependency providers and suppliers.
 
     The container maintains mappings from concrete types to provider factories or pre-built instances, resolves
     dependencies on demand, and enforces label matching when multiple variants are registered.
+
+    Registrations of each concrete type are kept in a `LabelIndex`, an inverted index from labels to registration ids,
+    so label queries are intersections rather than scans. Every factory and consumer is compiled into a `Plan` once,
+    and every (concrete type, labels) query is memoized as a `Binding` pointing at the matching instances and provider
+    plans, the `list[T]` fallback on the candidates of `T` included.
+
+    Synchronous resolutions are compiled into a `Graph` whose nodes are in topological order, and executed in a single
+    pass over the nodes, without recursion. Graphs are memoized per query (and per consumer), and both bindings and
+    graphs are dropped whenever `register` adds an option of a concrete type they depend on, so later resolutions only
+    execute the cached graphs. `validate` checks every registration up front.
+
+    Providers whose type contains type variables (e.g. `Repository[T]`) are templates. A query of their generic
+    class without registrations of its own is bound to their specializations: the template type is unified with the
+    query, and the specialized provider and plan are memoized per template and concrete type.
+
+    With `subtypes=True`, a class without registrations of its own is bound to the registrations of its subclasses.
+    Every registered type is indexed under the classes of its MRO, and virtual subclasses of ABCs are found with
+    `issubclass`, once per registered type and ABC.
+
+    `Iterator[T]` parameters receive a generator building the candidates of `T` one at a time, as they are consumed,
+    and `Lazy[T]` parameters a handle resolving `T` on first access.
+
+    Instances built by providers are cached according to their `Lifetime`: singletons in the root container, scoped
+    instances in the container (scope) that resolved them.
+
+    Child containers created by `child` are scopes layered over their parent. Creating one copies nothing: it reads
+    the registry, plans, graphs and singletons of its parent, and only holds its own scoped instances. Options
+    registered into a child form an overlay visible to the child (and its own children) only. Graphs of the parent
+    that do not involve the overlaid types are reused as they are; the others are expanded again in the child. A
+    child entered with `with` is bound to the current `contextvars` context (and thus inherited by the asyncio tasks
+    it creates), so `active` finds it.
+
+    The `*_async` methods resolve the same graph with coroutine functions allowed as factories and consumers. The
+    arguments of a factory and the candidates of a multi-value dependency are built concurrently with `asyncio.gather`,
+    and a singleton or scoped instance requested by several branches at once is built by a single task.
+
+    When an executor is given, the nodes of a graph whose dependencies are ready are built concurrently on the executor
+    instead. Singleton and scoped instances are guarded by per-provider locks, so they are built exactly once even when
+    several threads request them.
+
+    With `codegen=True`, graphs are executed by Python code generated for each of them instead (see `generate`), where
+    every provider is called directly with literal arguments. Hooks and executors fall back to the interpreted
+    execution.
+
+    `freeze` seals the registry: further registrations are rejected, and the graphs of every registration are computed
+    up front. Since nothing invalidates them anymore, resolving from many threads at once only reads the memoized
+    tables, without any lock; locks are only taken to build a singleton or scoped instance for the first time.
+
+    Providers whose factories are generators or return context managers are managed: their instances are torn down
+    by `close` (and by leaving a scope, for scoped and transient instances), each one before the instances it was built
+    from, and in parallel on the executor when there is one. Graphs involving managed providers track which teardowns
+    every node reached while they are built, and are always interpreted.
+
+    Hooks installed with `add_hook` receive a `TraceEvent` when reflecting options, compiling plans, calling provider
+    factories and calling consumers begins and ends. Without hooks, tracing costs a single check per step.
     """
 
-    _providers: dict[ConcreteType, list[_Labeled[Provider]]]
-    _instances: dict[ConcreteType, list[_Labeled[object]]]
+    _providers: dict[ConcreteType, LabelIndex[Provider]]
+    _instances: dict[ConcreteType, LabelIndex[object]]
+    _plans: dict[object, Plan]
+    _bindings: dict[ConcreteType, dict[frozenset[str], Binding]]
+    _graphs: dict["_GraphKey", Graph]
+    _dependents: dict[ConcreteType, set["_GraphKey"]]
+    _singletons: "_InstanceCache"
+    _scoped: "_InstanceCache"
+    _executor: Executor | None
+    _codegen: bool
+    _hooks: list[Hook]
+    _parent: "DependencyContainer | None"
+    _overlay: set[ConcreteType]
+    _templates: dict[type, LabelIndex[Provider]]
+    _specializations: dict[tuple[Provider, ConcreteType], tuple[Provider, Plan] | None]
+    _generics: set[type]
+    _subtypes: bool
+    _subclasses: dict[type, dict[ConcreteType, None]]
+    _virtual: dict[type, dict[ConcreteType, None]]
+    _frozen: bool
+    _tokens: "list[Token[DependencyContainer | None]]"
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        parent: "DependencyContainer | None" = None,
+        *,
+        executor: Executor | None = None,
+        codegen: bool = False,
+        subtypes: bool = False,
+    ) -> None:
         """Prepare internal storage for providers and cached instances.
 
         Initialization creates dictionaries for provider factories and supplier-backed instances so subsequent
-        registrations and resolutions operate on fresh state.
+        registrations and resolutions operate on fresh state. When a parent is given, the new container is a scope
+        reading through to the registry of the parent, and sharing its plans, singletons, hooks, executor, code
+        generation and subtype settings.
+
+        Args:
+            parent: Optional container the new container is a scope of.
+            executor: Optional executor building independent providers in parallel, e.g. a `ThreadPoolExecutor`.
+            codegen: Whether to execute graphs with generated code rather than interpreting them.
+            subtypes: Whether a class without registrations of its own resolves to the registrations of its subclasses.
 
         Returns:
             None
         """
         self._providers = {}
         self._instances = {}
+        self._bindings = {}
+        self._graphs = {}
+        self._dependents = {}
+        if parent is None:
+            self._plans = {}
+            self._singletons = _InstanceCache()
+            self._hooks = []
+        else:
+            self._plans = parent._plans
+            self._singletons = parent._singletons
+            self._hooks = parent._hooks
+            executor = executor or parent._executor
+            codegen = codegen or parent._codegen
+            subtypes = subtypes or parent._subtypes
+        self._scoped = _InstanceCache()
+        self._executor = executor
+        self._codegen = codegen
+        self._parent = parent
+        self._overlay = set()
+        self._templates = {}
+        self._specializations = {}
+        self._generics = set()
+        self._subtypes = subtypes
+        self._subclasses = {}
+        self._virtual = {}
+        self._frozen = False
+        self._tokens = []
+        if parent is None:
+            _roots.add(self)
+
+    def child(self) -> "DependencyContainer":
+        """Create a new scope over this container, in constant time.
+
+        The child sees the registrations and singletons of this container. Options registered through the child are
+        only visible to the child, e.g. the request being handled.
+
+        Returns:
+            Child container holding its own registrations and scoped instances.
+        """
+        return DependencyContainer(self, executor=self._executor)
+
+    def active(self) -> "DependencyContainer":
+        """Return the innermost scope of this container entered in the current context, or this container itself.
+
+        Returns:
+            The container resolutions should go through.
+        """
+        scope = _active.get()
+        if scope is not None:
+            container: DependencyContainer | None = scope
+            while container is not None:
+                if container is self:
+                    return scope
+                container = container._parent
+        return self
+
+    def __enter__(self) -> "DependencyContainer":
+        self._tokens.append(_active.set(self))
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        _active.reset(self._tokens.pop())
+        if not self._tokens:
+            # Scoped instances do not outlive the scope.
+            scoped, self._scoped = self._scoped, _InstanceCache()
+            tear_down(scoped.detach(), self._executor)
+
+    async def __aenter__(self) -> "DependencyContainer":
+        return self.__enter__()
+
+    async def __aexit__(self, *_: object) -> None:
+        _active.reset(self._tokens.pop())
+        if not self._tokens:
+            scoped, self._scoped = self._scoped, _InstanceCache()
+            await tear_down_async(scoped.detach())
+
+    @property
+    def frozen(self) -> bool:
+        """Whether the registry has been sealed by `freeze`."""
+        return self._frozen
+
+    def freeze(self, consumers: Iterable[Callable[..., object]] = ()) -> None:
+        """Seal the registry, rejecting further registrations, and precompute its lookup tables.
+
+        The graph of every registered (concrete type, labels) pair, and of every given consumer, is computed right away,
+        so later resolutions only read memoized tables. Graphs that cannot be computed (e.g. because a dependency is
+        missing, or a signature cannot be reflected) are left out, and fail when they are resolved, as usual. Freezing
+        twice does nothing.
+
+        Args:
+            consumers: Callables whose graphs should be precomputed as well.
+
+        Returns:
+            None
+        """
+        if self._frozen:
+            return
+        queries: dict[tuple[ConcreteType, frozenset[str]], None] = {}
+        for concrete in list(self._instances) + list(self._providers):
+            queries[(concrete, frozenset())] = None
+        for index in self._providers.values():
+            for provider in index:
+                queries[(provider.concrete_type, frozenset(provider.labels))] = None
+        keys: list[_GraphKey] = list(queries)
+        for consumer in consumers:
+            try:
+                keys.append(self._plan(consumer))
+            except _UNRESOLVABLE:
+                pass
+        for key in keys:
+            try:
+                _ = self._graph(key)
+            except _UNRESOLVABLE:
+                pass
+        self._frozen = True
+        # Graphs are never invalidated anymore.
+        self._dependents.clear()
+
+    def warmup(self) -> None:
+        """Build every fork-safe singleton, along with its dependencies.
+
+        Meant to be called in the master process of a pre-fork server, before forking workers: the workers then share
+        the singletons (copy-on-write) instead of building them each. Singletons of providers marked with
+        `fork_safe=False`, and the ones depending on them, are left to the workers.
+
+        Returns:
+            None
+
+        Raises:
+            MissingDependencyError: If a dependency of a singleton is not registered.
+        """
+        singletons = [
+            provider
+            for index in self._providers.values()
+            for provider in index
+            if provider.lifetime is Lifetime.singleton
+        ]
+        stale = self._stale(singletons)
+        for provider in singletons:
+            if provider not in stale:
+                _ = self._execute(self._graph(provider))
+
+    def start_warmup(self, *annotations: object, executor: Executor | None = None) -> Future[None]:
+        """Build singletons in the background, so that the process can serve requests while they are being built.
+
+        Every singleton is built (or only the singletons registered for the given annotations, along with the singletons
+        they depend on), each after its dependencies, on a dedicated daemon thread or on `executor`. Meanwhile, a
+        resolution needing a singleton that is not built yet either builds it itself, or waits for that singleton only
+        if the warm-up is building it at that very moment; singletons already built are used right away.
+
+        Args:
+            *annotations: Type annotations whose singletons are built; every singleton is built if none is given.
+            executor: Executor running the warm-up instead of a dedicated thread. Since the warm-up waits for
+                independent singletons built in parallel on the executor of the container (if any), it should not be
+                run on that executor.
+
+        Returns:
+            Future completed once every singleton is built, e.g. for readiness checks. It holds the error raised while
+            building a singleton, if any; the warm-up then stops.
+        """
+        if executor is not None:
+            return executor.submit(self._warm, annotations)
+        future: Future[None] = Future()
+
+        def run() -> None:
+            if not future.set_running_or_notify_cancel():
+                return
+            try:
+                self._warm(annotations)
+            except BaseException as error:
+                future.set_exception(error)
+            else:
+                future.set_result(None)
+
+        threading.Thread(target=run, name="injectionkit-warmup", daemon=True).start()
+        return future
+
+    def dependencies(self, provider: Provider) -> list[Provider]:
+        """Return the providers registered for the parameters of a provider, i.e. the ones its instances are built from.
+
+        Dependencies injected through `Lazy` or streams are not included, as they are only built on demand. Parameters
+        without candidates have no providers to return, and are not reported as missing either (see `validate`).
+
+        Args:
+            provider: A registered provider.
+
+        Returns:
+            The direct dependencies of the provider, in the order of its parameters.
+
+        Raises:
+            InvalidProviderFactoryError: If the factory of the provider is not callable, or cannot be imported.
+        """
+        return [
+            dependency
+            for slot in self._factory_plan(provider).slots
+            for dependency, _ in self._binding(slot.concrete, slot.labels).providers
+        ]
+
+    def close(self) -> None:
+        """Tear down the managed instances of this container, then release every registration and cached instance.
+
+        Instances built by generators and context managers (see `Provider`) are torn down first: the ones of the
+        container's lifetimes (singletons for a root container, scoped and transient instances for any container),
+        each before the instances it was built from. With an executor, independent branches of the graph are torn down
+        in parallel on it; otherwise instances are torn down one after another, in reverse order of construction.
+
+        Plans, memoized bindings and graphs, and the cached instances are then dropped, so that they can be
+        garbage-collected even if the container itself is still referenced. Resolutions through a closed container
+        fail, as nothing is registered anymore.
+
+        Returns:
+            None
+
+        Raises:
+            AsyncResolutionError: If an instance has to be torn down asynchronously, see `aclose`.
+        """
+        try:
+            tear_down(self._detach(), self._executor)
+        finally:
+            self._release()
+
+    async def aclose(self) -> None:
+        """Asynchronous counterpart of `close`, tearing independent branches down concurrently.
+
+        Returns:
+            None
+        """
+        try:
+            await tear_down_async(self._detach())
+        finally:
+            self._release()
+
+    def _stale(self, providers: Iterable[Provider]) -> set[Provider]:
+        # Providers that are fork-unsafe, or depend (directly or not) on a fork-unsafe provider. Each provider is
+        # visited once, without recursion; dependencies through `Lazy` or streams are not followed.
+        unsafe: dict[Provider, bool] = {}
+        visiting: set[Provider] = set()
+        for root in providers:
+            stack = [root]
+            while stack:
+                provider = stack[-1]
+                if provider in unsafe:
+                    _ = stack.pop()
+                    continue
+                visiting.add(provider)
+                dependencies = [
+                    dependency
+                    for dependency in self.dependencies(provider)
+                    if dependency not in visiting or dependency in unsafe
+                ]
+                pending = [dependency for dependency in dependencies if dependency not in unsafe]
+                if pending:
+                    stack.extend(pending)
+                    continue
+                _ = stack.pop()
+                visiting.discard(provider)
+                unsafe[provider] = not provider.fork_safe or any(unsafe[dependency] for dependency in dependencies)
+        return {provider for provider, stale in unsafe.items() if stale}
+
+    def _warm(self, annotations: tuple[object, ...]) -> None:
+        if annotations:
+            roots: list[Provider] = []
+            for hint in annotations:
+                typ = typeof(hint)
+                roots.extend(provider for provider, _ in self._binding(typ.concrete, frozenset(typ.labels)).providers)
+        else:
+            roots = [provider for index in self._providers.values() for provider in index]
+        # Singletons reached from the roots, dependencies first. Each provider is visited once, without recursion.
+        order: dict[Provider, None] = {}
+        visited: set[Provider] = set()
+        for root in roots:
+            stack = [(root, False)]
+            while stack:
+                provider, expanded = stack.pop()
+                if expanded:
+                    if provider.lifetime is Lifetime.singleton:
+                        order[provider] = None
+                    continue
+                if provider in visited:
+                    continue
+                visited.add(provider)
+                stack.append((provider, True))
+                stack.extend((dependency, False) for dependency in reversed(self.dependencies(provider)))
+        for provider in order:
+            if provider not in self._singletons.instances:
+                _ = self._execute(self._graph(provider))
+
+    def _forked(self) -> None:
+        # Instances of fork-unsafe providers, and the instances built from them, are rebuilt in the child process.
+        for cache in (self._singletons, self._scoped):
+            try:
+                stale = self._stale(list(cache.instances))
+            except InvalidProviderFactoryError:
+                stale = set(cache.instances)
+            cache.forked(stale)
+
+    def _detach(self) -> list[Exit]:
+        if self._parent is None:
+            return self._singletons.detach() + self._scoped.detach()
+        return self._scoped.detach()
+
+    def _release(self) -> None:
+        self._providers = {}
+        self._instances = {}
+        self._bindings = {}
+        self._graphs = {}
+        self._dependents = {}
+        self._overlay = set()
+        self._templates = {}
+        self._specializations = {}
+        self._generics = set()
+        self._subclasses = {}
+        self._virtual = {}
+        self._scoped = _InstanceCache()
+        if self._parent is None:
+            # Shared with the children, so cleared in place.
+            self._plans.clear()
+            self._singletons.clear()
+            self._hooks.clear()
+
+    def add_hook(self, hook: Hook) -> None:
+        """Install a hook receiving the trace events of this container, its parent and its children.
+
+        Args:
+            hook: Callback receiving every `TraceEvent`, e.g. a `ChromeTraceExporter`. It is called on the thread doing
+                the traced work, so it has to be thread-safe when resolving on an executor.
+
+        Returns:
+            None
+        """
+        self._hooks.append(hook)
+
+    def remove_hook(self, hook: Hook) -> None:
+        """Uninstall a hook installed with `add_hook`.
+
+        Args:
+            hook: The installed hook.
+
+        Returns:
+            None
+
+        Raises:
+            ValueError: If the hook is not installed.
+        """
+        self._hooks.remove(hook)
 
     def register(self, option: Provider | Supplier) -> None:
         """Register a provider or supplier for later resolution.
 
         The container distinguishes between eager instances and deferred factories, stores each under the appropriate
-        concrete type, and tracks labels for quick retrieval during resolution.
+        concrete type, and tracks labels for quick retrieval during resolution. Memoized bindings and graphs depending
+        on the registered concrete type are invalidated. With subtype resolution, the classes of the MRO of the type
+        are indexed as well, and the bindings and graphs of these base classes are invalidated too.
 
         Args:
             option: Provider or supplier describing how to construct or supply a dependency.
 
         Returns:
             None
+
+        Raises:
+            FrozenContainerError: If the container is frozen.
         """
-        if isinstance(option, Provider):
+        if self._frozen:
+            raise FrozenContainerError(option)
+        if self._hooks:
+            reflected = option.factory if isinstance(option, Provider) else type(option.instance)
+            _ = self._traced(TraceKind.reflect, reflected, None, 0, lambda: option.concrete_type)
+        touched = [option.concrete_type]
+        if isinstance(option, Provider) and generic(option.concrete_type):
+            # A template: its specializations may answer any query of its generic class.
+            origin = option.concrete_type.constructor
+            if origin not in self._templates:
+                self._templates[origin] = LabelIndex()
+            self._templates[origin].add(option, option.labels)
+            queried = {*self._bindings, *self._dependents}
+            touched.extend(concrete for concrete in queried if concrete.constructor is origin)
+            if self._parent is not None:
+                self._generics.add(origin)
+        elif isinstance(option, Provider):
             if option.concrete_type not in self._providers:
-                self._providers[option.concrete_type] = [_Labeled(option, option.labels)]
-            else:
-                self._providers[option.concrete_type].append(_Labeled(option, option.labels))
+                self._providers[option.concrete_type] = LabelIndex()
+            self._providers[option.concrete_type].add(option, option.labels)
         else:  # Supplier
             if option.concrete_type not in self._instances:
-                self._instances[option.concrete_type] = [_Labeled(option.instance, option.labels)]
-            else:
-                self._instances[option.concrete_type].append(_Labeled(option.instance, option.labels))
+                self._instances[option.concrete_type] = LabelIndex()
+            self._instances[option.concrete_type].add(option.instance, option.labels)
+        if self._subtypes:
+            touched.extend(self._index(option.concrete_type))
+        for concrete in touched:
+            listed = ConcreteType(list, (concrete,))
+            if self._parent is not None:
+                self._overlay.add(concrete)
+                self._overlay.add(listed)
+            _ = self._bindings.pop(concrete, None)
+            # The `list[T]` fallback is bound to the candidates of `T`.
+            _ = self._bindings.pop(listed, None)
+            for key in self._dependents.pop(concrete, ()):
+                _ = self._graphs.pop(key, None)
+
+    def validate(self, consumers: Iterable[Callable[..., object]] = ()) -> list[Provider]:
+        """Check the whole dependency graph without building anything.
+
+        Every registered provider, and every given consumer, is compiled and expanded along with its dependencies.
+
+        Args:
+            consumers: Callables whose parameters have to be resolvable as well.
+
+        Returns:
+            Every registered provider, in a topological build order: each provider comes after the providers it depends
+            on.
+
+        Raises:
+            InvalidProviderFactoryError: If a provider factory is not callable, or cannot be imported.
+            MissingDependencyError: If a dependency without default value has no candidate.
+            CircularDependencyError: If providers depend on each other in a cycle, listed in the error.
+        """
+        expansion = _Expansion(self)
+        for index in list(self._providers.values()):
+            for provider in index:
+                _ = expansion.provider(provider, self._factory_plan(provider))
+        for consumer in consumers:
+            _ = expansion.arguments(self._plan(consumer))
+        # What `Lazy` handles will resolve is checked too, although outside of the path of their dependents.
+        checked: set[tuple[ConcreteType, frozenset[str]]] = set()
+        while expansion.deferred:
+            query = expansion.deferred.pop()
+            if query not in checked:
+                checked.add(query)
+                _ = expansion.query(*query)
+        order: dict[Provider, None] = {}
+        for node in expansion.graph(()).nodes:
+            if node.provider is not None:
+                order[node.provider] = None
+        return list(order)
 
     def resolve(self, annotation: object) -> object | list[object]:
         """Resolve a dependency from a type annotation.
@@ -191,10 +1090,56 @@ class DependencyContainer(object):
 
         Raises:
             MissingDependencyError: If no matching provider or supplier is registered.
+            ScopeRequiredError: If a managed transient instance is resolved by the root container.
         """
         typ = typeof(annotation)
         return self.instantiate(typ.concrete, typ.labels)
 
+    def resolve_many(self, *annotations: object) -> list[object]:
+        """Resolve several dependencies in a single session.
+
+        The annotations are expanded into a single graph, memoized like the graph of a single annotation, and executed
+        in one pass. Every provider is built at most once for the whole batch: dependencies shared by several
+        annotations (e.g. the bottom of a diamond) are built once, even if they are transient.
+
+        Args:
+            *annotations: Type annotations to resolve.
+
+        Returns:
+            The resolved objects (or lists of objects), in the order of the annotations.
+
+        Raises:
+            MissingDependencyError: If one of the annotations has no matching provider or supplier.
+        """
+        queries: list[tuple[ConcreteType, frozenset[str]]] = []
+        for hint in annotations:
+            typ = typeof(hint)
+            queries.append((typ.concrete, frozenset(typ.labels)))
+        graph = self._graph(_Batch(tuple(queries)))
+        self._scope(graph)
+        return self._execute(graph)
+
+    def invoke(self, functor: Callable[..., object]) -> object:
+        """Call a function with all of its parameters injected.
+
+        The function is compiled into a plan on first use; parameters that cannot be resolved fall back to their default
+        values.
+
+        Args:
+            functor: Callable whose parameters should be injected.
+
+        Returns:
+            Whatever the callable returns.
+
+        Raises:
+            MissingDependencyError: If a parameter without default value cannot be resolved.
+        """
+        plan = self._plan(functor)
+        arguments = self._execute(self._graph(plan))
+        if self._hooks:
+            return self._traced(TraceKind.consume, functor, None, 0, lambda: plan.invoke(arguments))
+        return plan.invoke(arguments)
+
     def instantiate(self, concrete: ConcreteType, labels: set[str]) -> object | list[object]:
         """Resolve a concrete type by combining suppliers and providers.
 
@@ -212,36 +1157,547 @@ class DependencyContainer(object):
             InvalidProviderFactoryError: If a provider exposes a non-callable factory.
             MissingDependencyError: If no candidates satisfy the request.
         """
-        candidates: list[object] = []
-        if concrete in self._instances:
-            for labeled_instance in self._instances[concrete]:
-                if labels in labeled_instance:
-                    candidates.append(labeled_instance.value)
-        if concrete in self._providers:
-            providers: list[Provider] = []
-            for labeled_provider in self._providers[concrete]:
-                if labels in labeled_provider:
-                    providers.append(labeled_provider.value)
-            for provider in providers:
-                if not callable(provider.factory):
-                    raise InvalidProviderFactoryError(provider.factory)
-                signature = signatureof(provider.factory)
-                instantiator = Instantiator(provider.factory)
-                for parameter in signature.parameters:
-                    try:
-                        argument = self.instantiate(parameter.typ.concrete, parameter.typ.labels)
-                        instantiator.argument(parameter.name, argument)
-                    except MissingDependencyError:
-                        if parameter.default_value is Unspecified:
-                            raise
-                candidates.append(instantiator.instantiate())
+        graph = self._graph((concrete, frozenset(labels)))
+        self._scope(graph)
+        return self._execute(graph)[0]
+
+    async def resolve_async(self, annotation: object) -> object | list[object]:
+        """Asynchronous counterpart of `resolve`.
+
+        Args:
+            annotation: Type annotation passed from consumer or provider signatures.
+
+        Returns:
+            Object or list of objects that satisfy the annotation.
+
+        Raises:
+            MissingDependencyError: If no matching provider or supplier is registered.
+        """
+        typ = typeof(annotation)
+        return await self.instantiate_async(typ.concrete, typ.labels)
+
+    async def invoke_async(self, functor: Callable[..., object]) -> object:
+        """Asynchronous counterpart of `invoke`, awaiting the functor if it is a coroutine function.
+
+        Args:
+            functor: Callable whose parameters should be injected.
+
+        Returns:
+            Whatever the callable returns, awaited if necessary.
+
+        Raises:
+            MissingDependencyError: If a parameter without default value cannot be resolved.
+            CircularDependencyError: If the providers involved depend on each other in a cycle.
+        """
+        plan = self._plan(functor)
+        _ = self._graph(plan)
+        value, _ = await self._call_async(plan, None, 0)
+        return value
+
+    async def instantiate_async(self, concrete: ConcreteType, labels: set[str]) -> object | list[object]:
+        """Asynchronous counterpart of `instantiate`.
+
+        Args:
+            concrete: Concrete type descriptor targeted for resolution.
+            labels: Labels constraining the resolution scope.
+
+        Returns:
+            Single instance when exactly one candidate exists; otherwise, a list of all matching instances.
+
+        Raises:
+            InvalidProviderFactoryError: If a provider exposes a non-callable factory.
+            MissingDependencyError: If no candidates satisfy the request.
+            CircularDependencyError: If the providers involved depend on each other in a cycle.
+        """
+        self._scope(self._graph((concrete, frozenset(labels))))
+        value, _ = await self._instantiate_async(concrete, frozenset(labels), 1)
+        return value
+
+    # The asynchronous resolution returns every value along with the teardowns it reached, see `Reached`. It walks
+    # the bindings concurrently instead of executing the graph, which is only looked up (memoized, like for the
+    # synchronous resolution) beforehand: its expansion raises `CircularDependencyError`, where the walk would not end.
+
+    async def _instantiate_async(
+        self, concrete: ConcreteType, labels: frozenset[str], depth: int
+    ) -> tuple[object | list[object], Reached]:
+        if (concrete.constructor is Lazy and len(concrete.parameters) == 1) or self._streamed(concrete, labels):
+            return self._defer(concrete, labels), UNMANAGED
+        binding = self._binding(concrete, labels)
+        candidates: list[object] = list(binding.instances)
+        reached = UNMANAGED
+        if binding.providers:
+            provided = (self._provide_async(provider, plan, depth) for provider, plan in binding.providers)
+            for value, frontier in await asyncio.gather(*provided):
+                candidates.append(value)
+                reached |= frontier
         if not candidates:
-            if concrete.constructor is list and len(concrete.parameters) == 1:
-                inner_type = concrete.parameters[0]
-                inner_candidates = self.instantiate(inner_type, labels)
-                if isinstance(inner_candidates, list):
-                    return inner_candidates  # pyright: ignore[reportUnknownVariableType]
-            raise MissingDependencyError(concrete, labels)
+            raise MissingDependencyError(concrete, set(labels))
         if len(candidates) == 1:
-            return candidates[0]
-        return candidates
+            return candidates[0], reached
+        return candidates, reached
+
+    async def _provide_async(self, provider: Provider, plan: Plan, depth: int) -> tuple[object, Reached]:
+        cache = self._cache(provider)
+        if cache is None:
+            return await self._call_async(plan, provider, depth)
+        try:
+            return cache.instances[provider], cache.reached.get(provider, UNMANAGED)
+        except KeyError:
+            pass
+        # Concurrent branches requiring the same instance await the task of the first one instead of building again.
+        task = cache.tasks.get(provider)
+        if task is None:
+            task = asyncio.ensure_future(self._call_async(plan, provider, depth))
+            cache.tasks[provider] = task
+            try:
+                value, reached = await task
+            finally:
+                del cache.tasks[provider]
+            if reached:
+                cache.reached[provider] = reached
+            cache.instances[provider] = value
+            return value, reached
+        return await asyncio.shield(task)
+
+    async def _call_async(self, plan: Plan, provider: Provider | None, depth: int) -> tuple[object, Reached]:
+        # Arguments of the plan are resolved concurrently, one level deeper than the plan itself.
+        resolved = await asyncio.gather(*(self._argument_async(slot, depth + 1) for slot in plan.slots))
+        arguments = [value for value, _ in resolved]
+        dependencies = UNMANAGED.union(*(reached for _, reached in resolved))
+
+        async def call() -> tuple[object, Reached]:
+            result = await plan.invoke_async(arguments)
+            # Consumers are called, never entered.
+            if provider is None or not plan.managed:
+                return result, dependencies
+            teardown = Exit(provider, result, dependencies)
+            value = await teardown.enter_async()
+            self._owner(provider).exits.append(teardown)
+            return value, frozenset((teardown,))
+
+        if self._hooks:
+            kind = TraceKind.consume if provider is None else TraceKind.provide
+            return await self._traced_async(kind, plan.target, provider, depth, call)
+        return await call()
+
+    async def _argument_async(self, slot: Slot, depth: int) -> tuple[object, Reached]:
+        try:
+            return await self._instantiate_async(slot.concrete, slot.labels, depth)
+        except MissingDependencyError:
+            if slot.default is Unspecified:
+                raise
+            return slot.default, UNMANAGED
+
+    def _graph(self, key: "_GraphKey") -> Graph:
+        if self._parent is not None:
+            if not self._overlay:
+                return self._parent._graph(key)
+            if key not in self._graphs:
+                try:
+                    inherited = self._parent._graph(key)
+                except MissingDependencyError:
+                    pass
+                else:
+                    if inherited.types.isdisjoint(self._overlay) and not any(
+                        concrete.constructor in self._generics for concrete in inherited.types
+                    ):
+                        return inherited
+        graph = self._graphs.get(key)
+        if graph is None:
+            expansion = _Expansion(self, batch=isinstance(key, _Batch))
+            if isinstance(key, Plan):
+                graph = expansion.graph(expansion.arguments(key))
+            elif isinstance(key, Provider):
+                graph = expansion.graph((Selection((expansion.provider(key, self._factory_plan(key)),)),))
+            elif isinstance(key, _Batch):
+                graph = expansion.graph(tuple(expansion.query(*query) for query in key.queries))
+            else:
+                graph = expansion.graph((expansion.query(*key),))
+            self._graphs[key] = graph
+            # Once frozen, a graph computed concurrently by several threads is the same graph, and it is never
+            # invalidated, so it is published without lock nor bookkeeping.
+            if not self._frozen:
+                for concrete in expansion.types:
+                    self._dependents.setdefault(concrete, set()).add(key)
+        return graph
+
+    def _execute(self, graph: Graph) -> list[object]:
+        if self._codegen and self._executor is None and not self._hooks and not graph.managed:
+            return self._execute_generated(graph)
+        values: list[object] = [None] * len(graph.nodes)
+        # Teardowns reached by each node, only tracked when the graph has managed providers.
+        reached: list[Reached] | None = [UNMANAGED] * len(graph.nodes) if graph.managed else None
+        # Walk the graph backwards from its roots to find the nodes to build: supplied and already cached instances are
+        # taken as they are, so the dependencies of the latter are not needed at all.
+        pending: list[int] = []
+        needed = {node for root in graph.roots for node in root.nodes}
+        for index in range(len(graph.nodes) - 1, -1, -1):
+            if index not in needed:
+                continue
+            node = graph.nodes[index]
+            if node.deferred is not None:
+                values[index] = self._defer(*node.deferred)
+                continue
+            if node.provider is None:
+                values[index] = node.instance
+                continue
+            cache = self._cache(node.provider)
+            if cache is not None and node.provider in cache.instances:
+                values[index] = cache.instances[node.provider]
+                if reached is not None:
+                    reached[index] = cache.reached.get(node.provider, UNMANAGED)
+                continue
+            pending.append(index)
+            needed |= node.dependencies
+        pending.reverse()
+
+        if self._executor is not None and not getattr(_worker, "active", False):
+            self._build_parallel(graph, pending, values, reached, self._executor)
+        elif reached is None:
+            for index in pending:
+                values[index] = self._build(graph.nodes[index], values)
+        else:
+            for index in pending:
+                values[index], reached[index] = self._build_managed(graph.nodes[index], values, reached)
+        return [root.value(values) for root in graph.roots]
+
+    def _execute_generated(self, graph: Graph) -> list[object]:
+        singletons, scoped = self._singletons, self._scoped
+        cached = frozenset(
+            index
+            for index, provider in graph.shared
+            if provider in (singletons if provider.lifetime is Lifetime.singleton else scoped).instances
+        )
+        execute = graph.generated.get(cached)
+        if execute is None:
+            execute = generate(graph, cached)
+            graph.generated[cached] = execute
+        return execute(singletons, scoped, self._defer)
+
+    def _build_parallel(
+        self,
+        graph: Graph,
+        pending: list[int],
+        values: list[object],
+        reached: list[Reached] | None,
+        executor: Executor,
+    ) -> None:
+        waiting: dict[int, int] = {}
+        dependents: dict[int, list[int]] = {index: [] for index in pending}
+        for index in pending:
+            dependencies = graph.nodes[index].dependencies & dependents.keys()
+            waiting[index] = len(dependencies)
+            for dependency in dependencies:
+                dependents[dependency].append(index)
+
+        running: dict[Future[Any], int] = {}
+
+        def submit(index: int) -> None:
+            if reached is None:
+                running[executor.submit(_work, self._build, graph.nodes[index], values)] = index
+            else:
+                running[executor.submit(_work, self._build_managed, graph.nodes[index], values, reached)] = index
+
+        for index, count in waiting.items():
+            if not count:
+                submit(index)
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                index = running.pop(future)
+                if reached is None:
+                    values[index] = future.result()
+                else:
+                    values[index], reached[index] = future.result()
+                for dependent in dependents[index]:
+                    waiting[dependent] -= 1
+                    if not waiting[dependent]:
+                        submit(dependent)
+
+    def _build(self, node: Node, values: list[object]) -> object:
+        assert node.provider is not None and node.plan is not None
+        provider, plan = node.provider, node.plan
+        arguments = [argument.value(values) for argument in node.arguments]
+        cache = self._cache(provider)
+        if self._hooks:
+            # Only the factory call is traced, not waiting for another thread building the same instance.
+            invoke = partial(plan.invoke, arguments)
+
+            def build() -> object:
+                return self._traced(TraceKind.provide, plan.target, provider, node.depth, invoke)
+
+            return build() if cache is None else cache.get_or_build(provider, build)
+        if cache is None:
+            return plan.invoke(arguments)
+        return cache.get_or_build(provider, lambda: plan.invoke(arguments))
+
+    def _build_managed(self, node: Node, values: list[object], reached: list[Reached]) -> tuple[object, Reached]:
+        assert node.provider is not None and node.plan is not None
+        provider, plan = node.provider, node.plan
+        arguments = [argument.value(values) for argument in node.arguments]
+        dependencies = UNMANAGED.union(*(reached[dependency] for dependency in node.dependencies))
+
+        def call() -> tuple[object, Reached]:
+            result = plan.invoke(arguments)
+            if not plan.managed:
+                return result, dependencies
+            teardown = Exit(provider, result, dependencies)
+            value = teardown.enter()
+            self._owner(provider).exits.append(teardown)
+            return value, frozenset((teardown,))
+
+        def build() -> tuple[object, Reached]:
+            if self._hooks:
+                return self._traced(TraceKind.provide, plan.target, provider, node.depth, call)
+            return call()
+
+        cache = self._cache(provider)
+        if cache is None:
+            return build()
+
+        def shared() -> object:
+            value, frontier = build()
+            if frontier:
+                cache.reached[provider] = frontier
+            return value
+
+        return cache.get_or_build(provider, shared), cache.reached.get(provider, UNMANAGED)
+
+    def _defer(self, concrete: ConcreteType, labels: frozenset[str]) -> object:
+        inner = concrete.parameters[0]
+        if concrete.constructor in _STREAMS:
+            return self._stream(inner, labels)
+        if concrete.constructor in _ASYNC_STREAMS:
+            return self._stream_async(inner, labels)
+        return Lazy(
+            lambda: self.instantiate(inner, set(labels)),
+            lambda: self.instantiate_async(inner, set(labels)),
+        )
+
+    def _streamed(self, concrete: ConcreteType, labels: frozenset[str]) -> bool:
+        # An `Iterator[T]` query streams the candidates of `T`, unless iterators are registered as they are.
+        if len(concrete.parameters) != 1 or not (
+            concrete.constructor in _STREAMS or concrete.constructor in _ASYNC_STREAMS
+        ):
+            return False
+        binding = self._binding(concrete, labels)
+        return not binding.instances and not binding.providers
+
+    def _stream(self, concrete: ConcreteType, labels: frozenset[str]) -> Iterator[object]:
+        # Candidates are built when the consumer asks for them, in the order a `list[T]` would hold them.
+        binding = self._binding(concrete, labels)
+        yield from binding.instances
+        for provider, _ in binding.providers:
+            graph = self._graph(provider)
+            self._scope(graph)
+            yield self._execute(graph)[0]
+
+    async def _stream_async(self, concrete: ConcreteType, labels: frozenset[str]) -> AsyncIterator[object]:
+        binding = self._binding(concrete, labels)
+        for instance in binding.instances:
+            yield instance
+        for provider, plan in binding.providers:
+            self._scope(self._graph(provider))
+            value, _ = await self._provide_async(provider, plan, 1)
+            yield value
+
+    def _cache(self, provider: Provider) -> "_InstanceCache | None":
+        if provider.lifetime is Lifetime.singleton:
+            return self._singletons
+        if provider.lifetime is Lifetime.scoped:
+            return self._scoped
+        return None
+
+    def _index(self, concrete: ConcreteType) -> list[ConcreteType]:
+        # Index a registered type under its base classes, returning them (as queried types).
+        bases: list[ConcreteType] = []
+        constructor = concrete.constructor
+        for base in getattr(constructor, "__mro__", ())[1:]:
+            if base is not object:
+                self._subclasses.setdefault(base, {})[concrete] = None
+                bases.append(ConcreteType(base, ()))
+        # ABCs queried so far, anywhere in the scope chain, may count the type as a virtual subclass.
+        container: DependencyContainer | None = self
+        while container is not None:
+            for base in container._virtual:
+                if base is not constructor and _subclass(constructor, base):
+                    if container is self:
+                        self._virtual[base][concrete] = None
+                    bases.append(ConcreteType(base, ()))
+            container = container._parent
+        return bases
+
+    def _derived(self, base: type) -> dict[ConcreteType, None]:
+        # Types registered into this container that are subclasses of `base`, in registration order.
+        if not isinstance(base, ABCMeta):
+            return self._subclasses.get(base, {})
+        derived = self._virtual.get(base)
+        if not derived:
+            # `issubclass` is only asked once per registered type: later registrations update the memo (see `_index`).
+            # Empty memos are computed again, since a registered type may still become a virtual subclass of `base`.
+            registered = dict.fromkeys([*self._instances, *self._providers])
+            derived = {
+                concrete: None
+                for concrete in registered
+                if concrete.constructor is not base and _subclass(concrete.constructor, base)
+            }
+            self._virtual[base] = derived
+        return derived
+
+    def _subtyped(self, base: type, labels: frozenset[str]) -> tuple[list[object], list[tuple[Provider, Plan]]]:
+        instances: list[object] = []
+        providers: list[tuple[Provider, Plan]] = []
+        if self._parent is not None:
+            instances, providers = self._parent._subtyped(base, labels)
+        for concrete in self._derived(base):
+            if concrete in self._instances:
+                instances.extend(self._instances[concrete].match(labels))
+            if concrete in self._providers:
+                for provider in self._providers[concrete].match(labels):
+                    providers.append((provider, self._factory_plan(provider)))
+        return instances, providers
+
+    def _specialized(self, concrete: ConcreteType, labels: frozenset[str]) -> list[tuple[Provider, Plan]]:
+        # Specializations of the templates of the scope chain producing `concrete`, parents first.
+        providers = [] if self._parent is None else self._parent._specialized(concrete, labels)
+        templates = self._templates.get(concrete.constructor)
+        if templates is None:
+            return providers
+        for template in templates.match(labels):
+            key = (template, concrete)
+            if key not in self._specializations:
+                # Unified once per template and concrete type; the specialized plan is kept along with it.
+                specialization = None
+                substitution = unify(template.concrete_type, concrete)
+                if substitution is not None:
+                    provider = Provider(
+                        template.factory,
+                        regard=annotation(concrete, template.labels),
+                        lifetime=template.lifetime,
+                        fork_safe=template.fork_safe,
+                    )
+                    plan = self._plans.get(provider)
+                    if plan is None:
+                        plan = self._factory_plan(template).specialize(substitution)
+                        self._plans[provider] = plan
+                    specialization = (provider, plan)
+                self._specializations[key] = specialization
+            specialization = self._specializations[key]
+            if specialization is not None:
+                providers.append(specialization)
+        return providers
+
+    def _scope(self, graph: Graph) -> None:
+        # Managed transient instances resolved by the root container would pile up until it is closed, one per call.
+        # Consumers (`invoke`, i.e. `App.run`) are exempt: their instances are torn down when the application closes.
+        if graph.unowned and self._parent is None:
+            raise ScopeRequiredError(graph.unowned[0])
+
+    def _owner(self, provider: Provider) -> "_InstanceCache":
+        # Teardowns of transient instances belong to the scope that built them.
+        return self._singletons if provider.lifetime is Lifetime.singleton else self._scoped
+
+    def _binding(self, concrete: ConcreteType, labels: frozenset[str]) -> Binding:
+        if self._parent is not None and concrete not in self._overlay and concrete.constructor not in self._generics:
+            return self._parent._binding(concrete, labels)
+        bindings = self._bindings.setdefault(concrete, {})
+        binding = bindings.get(labels)
+        if binding is None:
+            instances: list[object] = []
+            providers: list[tuple[Provider, Plan]] = []
+            if self._parent is not None:
+                # Candidates of the parent come first, as if the overlay had been registered last.
+                inherited = self._parent._binding(concrete, labels)
+                if not inherited.fallback:
+                    instances.extend(inherited.instances)
+                    providers.extend(inherited.providers)
+            if concrete in self._instances:
+                instances.extend(self._instances[concrete].match(labels))
+            if concrete in self._providers:
+                for provider in self._providers[concrete].match(labels):
+                    providers.append((provider, self._factory_plan(provider)))
+            binding = Binding(tuple(instances), tuple(providers))
+            inner = _listed(concrete)
+            if not instances and not providers and inner is not None:
+                # Without `list[T]` registrations, several candidates of `T` make up the list.
+                element = self._binding(inner, labels)
+                if len(element.instances) + len(element.providers) > 1:
+                    binding = Binding(element.instances, element.providers, fallback=True)
+            elif not instances and not providers and concrete.parameters:
+                specialized = self._specialized(concrete, labels)
+                if specialized:
+                    binding = Binding((), tuple(specialized), fallback=True)
+            elif not instances and not providers and self._subtypes:
+                # Exact registrations take precedence over the registrations of subclasses.
+                derived_instances, derived_providers = self._subtyped(concrete.constructor, labels)
+                if derived_instances or derived_providers:
+                    binding = Binding(tuple(derived_instances), tuple(derived_providers), fallback=True)
+                elif isinstance(concrete.constructor, ABCMeta):
+                    return binding  # not memoized, like the empty memo of `_derived`
+            bindings[labels] = binding
+        return binding
+
+    def _factory_plan(self, provider: Provider) -> Plan:
+        # Specializations of templates are compiled under the provider itself, since they share the template factory.
+        plan = self._plans.get(provider) or self._plans.get(provider.factory)
+        if plan is None:
+            # Factories given as import paths are imported here, the first time their provider is needed.
+            factory = provider.load_factory()
+            if not callable(factory):
+                raise InvalidProviderFactoryError(provider.factory)
+            plan = self._plan(factory)
+            self._plans[provider.factory] = plan
+        return plan
+
+    def _plan(self, target: Callable[..., object]) -> Plan:
+        plan = self._plans.get(target)
+        if plan is None:
+            if self._hooks:
+                plan = self._traced(TraceKind.reflect, target, None, 0, lambda: Plan(target))
+            else:
+                plan = Plan(target)
+            self._plans[target] = plan
+        return plan
+
+    def _traced(
+        self, kind: TraceKind, target: object, provider: Provider | None, depth: int, call: Callable[[], _R]
+    ) -> _R:
+        span = next(spans)
+        self._emit(TracePhase.begin, kind, span, target, provider, depth)
+        try:
+            return call()
+        finally:
+            self._emit(TracePhase.end, kind, span, target, provider, depth)
+
+    async def _traced_async(
+        self, kind: TraceKind, target: object, provider: Provider | None, depth: int, call: Callable[[], Awaitable[_R]]
+    ) -> _R:
+        span = next(spans)
+        self._emit(TracePhase.begin, kind, span, target, provider, depth)
+        try:
+            return await call()
+        finally:
+            self._emit(TracePhase.end, kind, span, target, provider, depth)
+
+    def _emit(
+        self, phase: TracePhase, kind: TraceKind, span: int, target: object, provider: Provider | None, depth: int
+    ) -> None:
+        concrete, labels = (None, frozenset[str]()) if provider is None else (provider.concrete_type, provider.labels)
+        event = TraceEvent(
+            phase=phase,
+            kind=kind,
+            span=span,
+            name=nameof(target),
+            provider=provider,
+            concrete=concrete,
+            labels=frozenset(labels),
+            depth=depth,
+            thread=threading.get_ident(),
+            timestamp=time.perf_counter_ns(),
+        )
+        for hook in tuple(self._hooks):
+            hook(event)
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
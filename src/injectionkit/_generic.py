@@ -0,0 +1,100 @@
+from typing import Annotated, TypeAlias, TypeVar
+
+from .reflect import ConcreteType
+
+__all__ = ["Substitution", "generic", "unify", "substitute", "annotation"]
+
+Substitution: TypeAlias = dict[object, ConcreteType]
+"""Concrete types bound to the type variables of a template, keyed by type variable."""
+
+
+def generic(concrete: ConcreteType) -> bool:
+    """Whether a concrete type contains type variables, i.e. is produced by a provider template.
+
+    Args:
+        concrete: Concrete type to check.
+
+    Returns:
+        Whether one of the constructors of the type is a type variable.
+    """
+    return isinstance(concrete.constructor, TypeVar) or any(generic(parameter) for parameter in concrete.parameters)
+
+
+def unify(template: ConcreteType, concrete: ConcreteType) -> Substitution | None:
+    """Bind the type variables of `template` so that it becomes `concrete`.
+
+    E.g. `Repository[T]` and `Repository[User]` unify with `T` bound to `User`. Bounds and constraints of the type
+    variables are honoured when they are classes.
+
+    Args:
+        template: Concrete type containing type variables.
+        concrete: Concrete type without type variables.
+
+    Returns:
+        The substitution turning `template` into `concrete`, or `None` if there is none.
+    """
+    substitution: Substitution = {}
+    pending = [(template, concrete)]
+    while pending:
+        expected, actual = pending.pop()
+        variable = expected.constructor
+        if isinstance(variable, TypeVar):
+            bound = substitution.get(variable)
+            if bound is None:
+                if not _admits(variable, actual):
+                    return None
+                substitution[variable] = actual
+            elif bound != actual:
+                return None
+        elif expected.constructor is not actual.constructor or len(expected.parameters) != len(actual.parameters):
+            return None
+        else:
+            pending.extend(zip(expected.parameters, actual.parameters))
+    return substitution
+
+
+def _admits(variable: TypeVar, concrete: ConcreteType) -> bool:
+    try:
+        if variable.__constraints__:
+            return concrete.constructor in variable.__constraints__
+        bound = variable.__bound__
+        return not isinstance(bound, type) or issubclass(concrete.constructor, bound)
+    except TypeError:
+        return False
+
+
+def substitute(concrete: ConcreteType, substitution: Substitution) -> ConcreteType:
+    """Replace the type variables of a concrete type by their bound concrete types.
+
+    Args:
+        concrete: Concrete type containing type variables.
+        substitution: Concrete types bound to the type variables.
+
+    Returns:
+        The substituted concrete type; unbound type variables are left as they are.
+    """
+    if isinstance(concrete.constructor, TypeVar):
+        return substitution.get(concrete.constructor, concrete)
+    if not concrete.parameters:
+        return concrete
+    parameters = tuple(substitute(parameter, substitution) for parameter in concrete.parameters)
+    return ConcreteType(concrete.constructor, parameters)
+
+
+def annotation(concrete: ConcreteType, labels: set[str] | frozenset[str] = frozenset()) -> object:
+    """Rebuild a type annotation reflecting to a concrete type and labels.
+
+    Args:
+        concrete: Concrete type without type variables.
+        labels: Labels of the annotation.
+
+    Returns:
+        E.g. `Repository[User]`, or `Annotated[Repository[User], "label"]` with labels.
+    """
+    typ: object = concrete.constructor
+    if concrete.parameters:
+        parameters = tuple(annotation(parameter) for parameter in concrete.parameters)
+        typ = concrete.constructor[parameters if len(parameters) > 1 else parameters[0]]  # type: ignore[index]
+    if labels:
+        return Annotated[(typ, *sorted(labels))]  # type: ignore[valid-type]
+    return typ
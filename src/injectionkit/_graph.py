@@ -0,0 +1,114 @@
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, field
+from typing import TypeAlias
+
+from ._option import Provider
+from ._plan import Plan
+from .reflect import ConcreteType, Unspecified
+
+__all__ = ["CircularDependencyError"]
+
+
+class CircularDependencyError(Exception):
+    """Report that providers depend on each other in a cycle.
+
+    Attributes:
+        path: Providers forming the cycle, starting and ending with the same provider.
+    """
+
+    path: list[Provider]
+
+    def __init__(self, path: list[Provider]) -> None:
+        cycle = " -> ".join(getattr(provider.factory, "__qualname__", str(provider.factory)) for provider in path)
+        super().__init__(f"Circular dependency: {cycle}")
+        self.path = path
+
+
+@dataclass(frozen=True)
+class Selection(object):
+    """Candidates selected in a dependency graph for a (concrete type, labels) query.
+
+    Mirrors the result of `DependencyContainer.instantiate`: a single candidate resolves to its value, several
+    candidates resolve to a list, and no candidate resolves to the default value of the parameter.
+
+    Attributes:
+        nodes: Indices of the candidate nodes, in resolution order.
+        default: Value used when there is no candidate.
+    """
+
+    nodes: tuple[int, ...]
+    default: object = Unspecified
+
+    def value(self, values: Sequence[object]) -> object:
+        """Assemble the selected value from the values of the graph nodes.
+
+        Args:
+            values: Values of the nodes of the graph, by index.
+
+        Returns:
+            The selected value.
+        """
+        if not self.nodes:
+            return self.default
+        if len(self.nodes) == 1:
+            return values[self.nodes[0]]
+        return [values[node] for node in self.nodes]
+
+
+@dataclass(frozen=True)
+class Node(object):
+    """A single step of a dependency graph: a supplied instance, a provider call or a deferred query.
+
+    Attributes:
+        provider: Provider called by the step, or `None` for a supplied instance or a deferred query.
+        plan: Compiled plan of the provider factory, or `None` for a supplied instance or a deferred query.
+        instance: The supplied instance, when `provider` is `None`.
+        arguments: Selections feeding the slots of `plan`, aligned with `Plan.slots`.
+        deferred: Query answered by a handle resolving it on demand (e.g. `Lazy[T]` and its labels), if any.
+        depth: Depth of the step in the dependency graph: providers selected by the roots are at depth 1, their
+            dependencies at depth 2, and so on.
+    """
+
+    provider: Provider | None
+    plan: Plan | None
+    instance: object = None
+    arguments: tuple[Selection, ...] = ()
+    deferred: tuple[ConcreteType, frozenset[str]] | None = None
+    depth: int = 1
+
+    @property
+    def dependencies(self) -> set[int]:
+        """Indices of the nodes this node depends on."""
+        return {node for argument in self.arguments for node in argument.nodes}
+
+
+Generated: TypeAlias = Callable[..., list[object]]
+"""Generated code executing a graph, called with the singleton cache, the scoped cache and the factory of lazy handles,
+and returning the values of the roots."""
+
+
+@dataclass(frozen=True)
+class Graph(object):
+    """Dependency graph of a resolution, with nodes in topological order.
+
+    Every node only depends on nodes with a smaller index. Singleton and scoped providers appear at most once, while
+    transient providers appear once per injection, just like they are called once per injection.
+
+    Attributes:
+        nodes: Steps of the resolution, dependencies first.
+        roots: Selections making up the result of the resolution.
+        types: Concrete types whose registrations were consulted to expand the graph.
+        shared: Nodes of singleton and scoped providers, as (index, provider) pairs.
+        managed: Whether a provider of the graph is managed (see `Plan.managed`), so that building it records teardowns.
+        unowned: Managed transient providers whose instances are not built into a singleton or scoped instance, so that
+            only a scope bounds their lifetime.
+        generated: Code generated to execute the graph, per set of shared nodes already cached (see `generate`).
+    """
+
+    nodes: tuple[Node, ...]
+    roots: tuple[Selection, ...]
+    types: frozenset[ConcreteType] = frozenset()
+    shared: tuple[tuple[int, Provider], ...] = ()
+    managed: bool = False
+    unowned: tuple[Provider, ...] = ()
+    generated: dict[frozenset[int], Generated] = field(default_factory=dict, compare=False, repr=False)
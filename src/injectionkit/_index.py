@@ -0,0 +1,76 @@
+from collections.abc import Iterable, Iterator
+from typing import Generic, TypeVar, final
+
+__all__ = ["LabelIndex"]
+
+_T = TypeVar("_T")
+
+
+@final
+class LabelIndex(Generic[_T]):
+    """Inverted label index over the registrations of a single concrete type.
+
+    Every registration gets an id in registration order. Each label maps to a bitset (a Python `int`) of the ids of the
+    registrations carrying it, so a label query is a bitwise AND of the postings of the requested labels, and the
+    matches are enumerated in registration order from the resulting bits.
+
+    A query without labels only matches registrations without labels, which are tracked by a dedicated bitset.
+    """
+
+    _values: list[_T]
+    _unlabeled: int
+    _postings: dict[str, int]
+
+    def __init__(self) -> None:
+        self._values = []
+        self._unlabeled = 0
+        self._postings = {}
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __iter__(self) -> Iterator[_T]:
+        return iter(self._values)
+
+    def add(self, value: _T, labels: Iterable[str]) -> None:
+        """Append a registration to the index.
+
+        Args:
+            value: Registered value.
+            labels: Labels carried by the registration.
+
+        Returns:
+            None
+        """
+        bit = 1 << len(self._values)
+        self._values.append(value)
+        labeled = False
+        for label in labels:
+            self._postings[label] = self._postings.get(label, 0) | bit
+            labeled = True
+        if not labeled:
+            self._unlabeled |= bit
+
+    def match(self, labels: frozenset[str]) -> list[_T]:
+        """Return the registrations whose labels contain every label of the query, in registration order.
+
+        Args:
+            labels: Labels required by the query.
+
+        Returns:
+            Matching registrations.
+        """
+        if not labels:
+            bits = self._unlabeled
+        else:
+            bits = -1
+            for label in labels:
+                bits &= self._postings.get(label, 0)
+                if not bits:
+                    return []
+        matches: list[_T] = []
+        while bits:
+            lowest = bits & -bits
+            matches.append(self._values[lowest.bit_length() - 1])
+            bits ^= lowest
+        return matches
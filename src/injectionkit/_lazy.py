@@ -0,0 +1,79 @@
+import threading
+from collections.abc import Awaitable, Callable
+from typing import Generic, TypeVar, cast, final
+
+__all__ = ["Lazy"]
+
+_T = TypeVar("_T")
+
+_UNRESOLVED = object()
+
+
+@final
+class Lazy(Generic[_T]):
+    """Handle on a dependency that is only resolved when it is first accessed.
+
+    Declaring a parameter as `Lazy[T]` (or `Annotated[Lazy[T], "label", ...]` to filter by labels) injects a cheap
+    handle instead of building `T` up front. The first call to `get` resolves `T` exactly as a `T` parameter would have
+    been resolved, and later calls return the same object.
+
+    Handles are created by the container; the dependency is resolved in the scope that injected the handle.
+    """
+
+    _resolve: Callable[[], object]
+    _resolve_async: Callable[[], Awaitable[object]]
+    _value: object
+    _lock: threading.Lock
+
+    def __init__(self, resolve: Callable[[], object], resolve_async: Callable[[], Awaitable[object]]) -> None:
+        """Wrap the callbacks resolving the dependency.
+
+        Args:
+            resolve: Callback resolving the dependency synchronously.
+            resolve_async: Coroutine function resolving the dependency asynchronously.
+
+        Returns:
+            None
+        """
+        self._resolve = resolve
+        self._resolve_async = resolve_async
+        self._value = _UNRESOLVED
+        self._lock = threading.Lock()
+
+    @property
+    def resolved(self) -> bool:
+        """Whether the dependency has been resolved already."""
+        return self._value is not _UNRESOLVED
+
+    def get(self) -> _T:
+        """Resolve the dependency on first access, and return it.
+
+        Returns:
+            The resolved dependency.
+
+        Raises:
+            MissingDependencyError: If the dependency cannot be resolved.
+        """
+        if self._value is _UNRESOLVED:
+            with self._lock:
+                if self._value is _UNRESOLVED:
+                    self._value = self._resolve()
+        return cast(_T, self._value)
+
+    async def get_async(self) -> _T:
+        """Asynchronous counterpart of `get`, allowing asynchronous providers.
+
+        Returns:
+            The resolved dependency.
+
+        Raises:
+            MissingDependencyError: If the dependency cannot be resolved.
+        """
+        if self._value is _UNRESOLVED:
+            self._value = await self._resolve_async()
+        return cast(_T, self._value)
+
+    def __repr__(self) -> str:
+        if self._value is _UNRESOLVED:
+            return "Lazy(<unresolved>)"
+        return f"Lazy({self._value!r})"
@@ -0,0 +1,252 @@
+import asyncio
+import inspect
+from collections.abc import AsyncGenerator, AsyncIterator, Generator, Iterator
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, wait
+from contextlib import AbstractAsyncContextManager, AbstractContextManager
+from typing import TYPE_CHECKING, Any, TypeAlias, final
+
+from .reflect import ConcreteType
+
+if TYPE_CHECKING:
+    from ._option import Provider  # `_option` depends on this module
+
+__all__ = [
+    "managed",
+    "produced",
+    "Exit",
+    "Reached",
+    "UNMANAGED",
+    "dependents_first",
+    "tear_down",
+    "tear_down_async",
+]
+
+_GENERATORS: set[object] = {Iterator, Generator, AsyncIterator, AsyncGenerator}
+_MANAGERS: set[object] = {AbstractContextManager, AbstractAsyncContextManager}
+
+
+def managed(target: object, returns: ConcreteType | None) -> bool:
+    """Whether a factory produces its instance through a context manager, which tears the instance down afterwards.
+
+    Generator functions (`yield` the instance, then clean it up), asynchronous generator functions, functions decorated
+    with `contextlib.contextmanager` or `contextlib.asynccontextmanager`, and factories annotated to return a
+    `ContextManager[T]` or `AsyncContextManager[T]` are managed.
+
+    Args:
+        target: The factory.
+        returns: Concrete return type declared by the factory, if any.
+
+    Returns:
+        Whether the factory is managed.
+    """
+    unwrapped = inspect.unwrap(target) if callable(target) else target
+    if inspect.isgeneratorfunction(unwrapped) or inspect.isasyncgenfunction(unwrapped):
+        return True
+    return returns is not None and returns.constructor in _MANAGERS
+
+
+def produced(returns: ConcreteType) -> ConcreteType:
+    """Return the type of the instances produced by a managed factory declaring `returns`.
+
+    E.g. `Iterator[T]`, `Generator[T, None, None]`, `AsyncIterator[T]` and `ContextManager[T]` produce `T`; other
+    declarations are taken as they are.
+
+    Args:
+        returns: Concrete return type declared by the managed factory.
+
+    Returns:
+        Concrete type of the produced instances.
+    """
+    if (returns.constructor in _GENERATORS or returns.constructor in _MANAGERS) and returns.parameters:
+        return returns.parameters[0]
+    return returns
+
+
+@final
+class Exit(object):
+    """Teardown of an instance produced by a managed provider, i.e. a generator or a context manager.
+
+    Attributes:
+        provider: Provider of the instance.
+        dependencies: Closest teardowns among the dependencies of the instance, which must only run after this one.
+    """
+
+    provider: "Provider"
+    dependencies: frozenset["Exit"]
+    _manager: Any
+
+    def __init__(self, provider: "Provider", manager: object, dependencies: frozenset["Exit"]) -> None:
+        self.provider = provider
+        self._manager = manager
+        self.dependencies = dependencies
+
+    def enter(self) -> object:
+        """Run the manager up to the instance, and return it.
+
+        Raises:
+            AsyncResolutionError: If the manager is asynchronous.
+        """
+        manager = self._manager
+        if inspect.isgenerator(manager):
+            try:
+                return next(manager)
+            except StopIteration:
+                raise RuntimeError(f"`{manager}` didn't yield") from None
+        if hasattr(manager, "__enter__"):
+            return manager.__enter__()
+        from ._plan import AsyncResolutionError  # `_plan` depends on this module
+
+        raise AsyncResolutionError(manager)
+
+    async def enter_async(self) -> object:
+        """Asynchronous counterpart of `enter`, accepting asynchronous managers too."""
+        manager = self._manager
+        if inspect.isasyncgen(manager):
+            try:
+                return await manager.__anext__()
+            except StopAsyncIteration:
+                raise RuntimeError(f"`{manager}` didn't yield") from None
+        if hasattr(manager, "__aenter__"):
+            return await manager.__aenter__()
+        return self.enter()
+
+    def close(self) -> None:
+        """Tear the instance down.
+
+        Raises:
+            AsyncResolutionError: If the manager is asynchronous.
+        """
+        manager = self._manager
+        if inspect.isgenerator(manager):
+            try:
+                next(manager)
+            except StopIteration:
+                return
+            raise RuntimeError(f"`{manager}` didn't stop")
+        if hasattr(manager, "__exit__"):
+            _ = manager.__exit__(None, None, None)
+            return
+        from ._plan import AsyncResolutionError  # `_plan` depends on this module
+
+        raise AsyncResolutionError(manager)
+
+    async def aclose(self) -> None:
+        """Asynchronous counterpart of `close`, accepting asynchronous managers too."""
+        manager = self._manager
+        if inspect.isasyncgen(manager):
+            try:
+                await manager.__anext__()
+            except StopAsyncIteration:
+                return
+            raise RuntimeError(f"`{manager}` didn't stop")
+        if hasattr(manager, "__aexit__"):
+            _ = await manager.__aexit__(None, None, None)
+            return
+        self.close()
+
+
+Reached: TypeAlias = frozenset[Exit]
+"""Closest teardowns a value depends on: its own if it is managed, otherwise the ones its dependencies reached."""
+
+UNMANAGED: Reached = frozenset()
+
+
+def _waiting(exits: list[Exit], members: set[Exit]) -> dict[Exit, int]:
+    """Count, for every teardown, the teardowns among `members` that depend on it and must run before it."""
+    waiting = dict.fromkeys(exits, 0)
+    for teardown in exits:
+        for dependency in teardown.dependencies & members:
+            waiting[dependency] += 1
+    return waiting
+
+
+def dependents_first(exits: list[Exit]) -> list[Exit]:
+    """Order teardowns so that each one comes before the teardowns of its dependencies.
+
+    Teardowns are collected per lifetime, so their concatenation is not in construction order (e.g. a singleton may be
+    built from a transient instance); they are ordered by their dependencies instead. Among independent teardowns, the
+    later ones in `exits` come first.
+    """
+    members = set(exits)
+    waiting = _waiting(exits, members)
+    ready = [teardown for teardown in exits if not waiting[teardown]]
+    order: list[Exit] = []
+    while ready:
+        teardown = ready.pop()
+        order.append(teardown)
+        for dependency in teardown.dependencies & members:
+            waiting[dependency] -= 1
+            if not waiting[dependency]:
+                ready.append(dependency)
+    return order
+
+
+def tear_down(exits: list[Exit], executor: Executor | None) -> None:
+    """Run teardowns, each one before the teardowns of its dependencies.
+
+    Without executor, they run one after another, dependents first (see `dependents_first`). With an executor, every
+    teardown whose dependents are all torn down is submitted right away, so independent branches are torn down in
+    parallel; once the executor is shut down, the remaining teardowns run on the calling thread. Every teardown runs
+    even if some fail; the first error is raised afterwards.
+    """
+    errors: list[BaseException] = []
+
+    def submit(teardown: Exit) -> Future[None]:
+        assert executor is not None
+        try:
+            return executor.submit(teardown.close)
+        except RuntimeError:  # the executor is shut down
+            future: Future[None] = Future()
+            try:
+                teardown.close()
+            except Exception as exception:
+                future.set_exception(exception)
+            else:
+                future.set_result(None)
+            return future
+
+    if executor is None:
+        for teardown in dependents_first(exits):
+            try:
+                teardown.close()
+            except Exception as exception:
+                errors.append(exception)
+    else:
+        members = set(exits)
+        waiting = _waiting(exits, members)
+        running: dict[Future[None], Exit] = {submit(teardown): teardown for teardown in exits if not waiting[teardown]}
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                teardown = running.pop(future)
+                error = future.exception()
+                if error is not None:
+                    errors.append(error)
+                for dependency in teardown.dependencies & members:
+                    waiting[dependency] -= 1
+                    if not waiting[dependency]:
+                        running[submit(dependency)] = dependency
+    if errors:
+        raise errors[0]
+
+
+async def tear_down_async(exits: list[Exit]) -> None:
+    """Asynchronous counterpart of `tear_down`, tearing independent branches down concurrently."""
+    members = set(exits)
+    dependents: dict[Exit, list[Exit]] = {teardown: [] for teardown in exits}
+    for teardown in exits:
+        for dependency in teardown.dependencies & members:
+            dependents[dependency].append(teardown)
+    tasks: dict[Exit, asyncio.Future[None]] = {}
+
+    async def close(teardown: Exit) -> None:
+        _ = await asyncio.gather(*(tasks[dependent] for dependent in dependents[teardown]), return_exceptions=True)
+        await teardown.aclose()
+
+    # Dependents come first, so their tasks exist when the tasks of their dependencies are created.
+    for teardown in dependents_first(exits):
+        tasks[teardown] = asyncio.ensure_future(close(teardown))
+    results = await asyncio.gather(*tasks.values(), return_exceptions=True)
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
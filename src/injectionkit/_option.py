@@ -1,11 +1,14 @@
+import importlib
 from collections.abc import Callable
 from dataclasses import dataclass
-from functools import cache
+from enum import Enum, auto
+from functools import cached_property
 from typing import TypeAlias
 
+from ._managed import managed, produced
 from .reflect import ConcreteType, signatureof, typeof
 
-__all__ = ["InvalidProviderFactoryError", "Provider", "Supplier", "Consumer", "Option"]
+__all__ = ["InvalidProviderFactoryError", "Lifetime", "Provider", "Supplier", "Consumer", "Option"]
 
 
 class InvalidProviderFactoryError(Exception):
@@ -25,25 +28,90 @@ class InvalidProviderFactoryError(Exception):
         self._factory = factory
 
 
+class Lifetime(Enum):
+    """Control how long an instance built by a provider is reused.
+
+    `transient` instances are built anew for every injection, `singleton` instances are built at most once per
+    container tree and shared by all of its scopes, and `scoped` instances are built at most once per scope (child
+    container), the root container being the outermost scope.
+    """
+
+    transient = auto()
+    singleton = auto()
+    scoped = auto()
+
+
 @dataclass(frozen=True)
 class Provider(object):
     """Describe a deferred dependency provider.
 
-    Wraps a factory callable or explicit regard type, supports singleton semantics, and exposes reflective helpers that
+    Wraps a factory callable or explicit regard type, supports lifetime semantics, and exposes reflective helpers that
     the container uses to determine the concrete type and labels produced by the provider.
 
+    `singleton=True` is a shorthand for `lifetime=Lifetime.singleton`; after construction both attributes are kept
+    consistent.
+
+    The factory may also be given as an import path, `"package.module:factory"`, along with the `regard` annotation of
+    what it produces. The module is then only imported (and the factory reflected) when the produced type is resolved
+    for the first time, so registering many providers costs no imports. Without `regard`, the module is imported as
+    soon as the provider is registered, to reflect the return annotation of the factory.
+
+    Factories may be generator functions, which `yield` the instance and then tear it down, or return a context manager
+    (e.g. `contextlib.contextmanager` functions), asynchronous ones included. Such a factory declaring `Iterator[T]`
+    (or `ContextManager[T]`...) produces `T`, and the instance is torn down when the container is closed.
+
+    `concrete_type` and `labels` are reflected once per provider and stored on the provider itself, so they are released
+    along with it.
+
     Attributes:
-        factory: Callable responsible for building dependency instances.
+        factory: Callable responsible for building dependency instances, or its `"module:attribute"` import path.
         regard: Optional type annotation that overrides reflection on the factory signature.
         singleton: Flag indicating whether the provider should reuse a cached instance.
+        lifetime: Lifetime of the instances built by the provider.
+        fork_safe: Whether cached instances can be shared with forked processes. Instances of fork-unsafe providers
+            (holding sockets, threads, locks...) and the instances built from them are rebuilt in forked children.
     """
 
     factory: object
     regard: object | None = None
     singleton: bool = False
+    lifetime: Lifetime = Lifetime.transient
+    fork_safe: bool = True
+
+    def __post_init__(self) -> None:
+        if self.singleton and self.lifetime is Lifetime.transient:
+            object.__setattr__(self, "lifetime", Lifetime.singleton)
+        elif self.lifetime is Lifetime.singleton:
+            object.__setattr__(self, "singleton", True)
+        elif self.singleton:
+            raise ValueError(f"Provider cannot be both singleton and {self.lifetime.name}")
+
+    def load_factory(self) -> object:
+        """Return the factory, importing it first if it is given as an import path.
+
+        Paths are either `"package.module:attribute"`, where the attribute may be dotted (e.g. `"module:Class.create"`),
+        or `"package.module.attribute"`.
 
-    @property
-    @cache
+        Returns:
+            The factory object, which still has to be checked for being callable.
+
+        Raises:
+            InvalidProviderFactoryError: If the path cannot be imported.
+        """
+        if not isinstance(self.factory, str):
+            return self.factory
+        module, separator, attributes = self.factory.partition(":")
+        if not separator:
+            module, _, attributes = self.factory.rpartition(".")
+        try:
+            target: object = importlib.import_module(module)
+            for attribute in attributes.split("."):
+                target = getattr(target, attribute)
+        except (ImportError, AttributeError, ValueError) as error:
+            raise InvalidProviderFactoryError(self.factory) from error
+        return target
+
+    @cached_property
     def concrete_type(self) -> ConcreteType:
         """Return the concrete type produced by the provider.
 
@@ -60,13 +128,15 @@ class Provider(object):
             regard_type = typeof(self.regard)
             return regard_type.concrete
         else:
-            factory_signature = signatureof(self.factory)
+            factory = self.load_factory()
+            factory_signature = signatureof(factory)
             if factory_signature.returns is None:
                 raise InvalidProviderFactoryError(self.factory)
+            if managed(factory, factory_signature.returns.concrete):
+                return produced(factory_signature.returns.concrete)
             return factory_signature.returns.concrete
 
-    @property
-    @cache
+    @cached_property
     def labels(self) -> set[str]:
         """Return the label set associated with this provider.
 
@@ -81,12 +151,12 @@ class Provider(object):
         """
         if self.regard is not None:
             regard_type = typeof(self.regard)
-            return regard_type.labels
+            return set(regard_type.labels)  # the reflected type is shared, see `typeof`
         else:
-            factory_signature = signatureof(self.factory)
+            factory_signature = signatureof(self.load_factory())
             if factory_signature.returns is None:
                 raise InvalidProviderFactoryError(self.factory)
-            return factory_signature.returns.labels
+            return set(factory_signature.returns.labels)
 
 
 @dataclass(frozen=True)
@@ -94,7 +164,7 @@ class Supplier(object):
     """Represent an eager dependency supplier.
 
     Encapsulates a pre-built instance and optional regard annotation, enabling the container to resolve dependencies
-    without invoking a factory.
+    without invoking a factory. Like for `Provider`, `concrete_type` and `labels` are stored on the supplier itself.
 
     Attributes:
         instance: Concrete object supplied to the container.
@@ -104,8 +174,7 @@ class Supplier(object):
     instance: object
     regard: object | None = None
 
-    @property
-    @cache
+    @cached_property
     def labels(self) -> set[str]:
         """Return the label set carried by the supplier.
 
@@ -117,11 +186,10 @@ class Supplier(object):
         """
         if self.regard is not None:
             regard_type = typeof(self.regard)
-            return regard_type.labels
+            return set(regard_type.labels)  # the reflected type is shared, see `typeof`
         return set()  # instance cannot carry any label
 
-    @property
-    @cache
+    @cached_property
     def concrete_type(self) -> ConcreteType:
         """Return the concrete type represented by the supplier.
 
@@ -143,12 +211,13 @@ class Consumer(object):
     """Describe a callable that expects dependencies to be injected.
 
     Stores the functor to be executed so the application can resolve its parameters and inject dependencies at runtime.
+    The functor may be a coroutine function when it is run by an `AsyncApp`.
 
     Attributes:
         functor: Callable executed during application runtime.
     """
 
-    functor: Callable[..., None]
+    functor: Callable[..., object]
 
 
 Option: TypeAlias = Provider | Supplier | Consumer
@@ -0,0 +1,183 @@
+import copy
+import inspect
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, replace
+from typing import TypeVar, final
+
+from ._generic import Substitution, annotation, substitute
+from ._managed import managed
+from ._option import Provider
+from .reflect import ConcreteType, ParameterKind, signatureof
+
+__all__ = ["AsyncResolutionError"]
+
+
+class AsyncResolutionError(Exception):
+    """Report that a coroutine function was reached by a synchronous resolution.
+
+    Asynchronous providers and consumers can only be resolved by the asynchronous API of the container, e.g. through
+    `AsyncApp`.
+
+    Attributes:
+        target: The asynchronous factory or consumer.
+    """
+
+    target: object
+
+    def __init__(self, target: object) -> None:
+        super().__init__(f"`{target}` is asynchronous and must be resolved asynchronously")
+        self.target = target
+
+
+@dataclass(frozen=True)
+class Slot(object):
+    """A single argument slot of a compiled plan.
+
+    Attributes:
+        name: Parameter name the resolved value is bound to.
+        concrete: Concrete type that has to be resolved for the slot.
+        labels: Labels constraining the resolution of the slot.
+        default: Default value of the parameter, or `Unspecified` when the parameter is required.
+    """
+
+    name: str
+    concrete: ConcreteType
+    labels: frozenset[str]
+    default: object
+
+    def specialize(self, substitution: Substitution) -> "Slot":
+        """Return the slot with the type variables of its concrete type substituted.
+
+        A `type[T]` slot defaults to the class bound to `T`, so that template factories receive it.
+
+        Args:
+            substitution: Concrete types bound to the type variables.
+
+        Returns:
+            The specialized slot.
+        """
+        concrete = substitute(self.concrete, substitution)
+        default = self.default
+        if (
+            self.concrete.constructor is type
+            and len(self.concrete.parameters) == 1
+            and isinstance(self.concrete.parameters[0].constructor, TypeVar)
+        ):
+            default = annotation(concrete.parameters[0])
+        return replace(self, concrete=concrete, default=default)
+
+
+@final
+class Plan(object):
+    """Flat, precompiled recipe for invoking a factory or consumer.
+
+    The callable is reflected exactly once when the plan is compiled. Its parameters are flattened into ordered
+    positional and keyword slots, so invoking the plan only binds the resolved values and calls the target, without
+    touching `inspect` or rebuilding an `Instantiator`.
+
+    Attributes:
+        target: Callable invoked when the plan is executed.
+        positional: Slots passed positionally, in declaration order.
+        keyword: Slots passed by keyword.
+        slots: Positional slots followed by keyword slots.
+        asynchronous: Whether the target is a coroutine function, whose result has to be awaited.
+        managed: Whether the target returns a generator or a context manager, which has to be entered to get the
+            instance, and exited to tear it down.
+    """
+
+    target: Callable[..., object]
+    positional: tuple[Slot, ...]
+    keyword: tuple[Slot, ...]
+    slots: tuple[Slot, ...]
+    asynchronous: bool
+    managed: bool
+
+    def __init__(self, target: Callable[..., object]) -> None:
+        self.target = target
+        self.asynchronous = inspect.iscoroutinefunction(target)
+        signature = signatureof(target)
+        self.managed = managed(target, None if signature.returns is None else signature.returns.concrete)
+        positional: list[Slot] = []
+        keyword: list[Slot] = []
+        for parameter in signature.parameters:
+            slot = Slot(
+                parameter.name,
+                parameter.typ.concrete,
+                frozenset(parameter.typ.labels),
+                parameter.default_value,
+            )
+            if parameter.kind == ParameterKind.positional:
+                positional.append(slot)
+            else:
+                keyword.append(slot)
+        self.positional = tuple(positional)
+        self.keyword = tuple(keyword)
+        self.slots = self.positional + self.keyword
+
+    def invoke(self, arguments: Sequence[object]) -> object:
+        """Invoke the target with already resolved arguments.
+
+        Args:
+            arguments: Argument values, aligned with `slots`.
+
+        Returns:
+            Object returned by the target callable.
+
+        Raises:
+            AsyncResolutionError: If the target is a coroutine function.
+        """
+        if self.asynchronous:
+            raise AsyncResolutionError(self.target)
+        count = len(self.positional)
+        kwargs = {slot.name: value for slot, value in zip(self.keyword, arguments[count:])}
+        return self.target(*arguments[:count], **kwargs)
+
+    def specialize(self, substitution: Substitution) -> "Plan":
+        """Return a copy of the plan with the type variables of its slots substituted, e.g. for a provider template.
+
+        Args:
+            substitution: Concrete types bound to the type variables.
+
+        Returns:
+            The specialized plan, calling the same target.
+        """
+        plan = copy.copy(self)
+        plan.positional = tuple(slot.specialize(substitution) for slot in self.positional)
+        plan.keyword = tuple(slot.specialize(substitution) for slot in self.keyword)
+        plan.slots = plan.positional + plan.keyword
+        return plan
+
+    async def invoke_async(self, arguments: Sequence[object]) -> object:
+        """Invoke the target with already resolved arguments, and await it if it is a coroutine function.
+
+        Args:
+            arguments: Argument values, aligned with `slots`.
+
+        Returns:
+            Object returned (or awaited) from the target callable.
+        """
+        count = len(self.positional)
+        kwargs = {slot.name: value for slot, value in zip(self.keyword, arguments[count:])}
+        result = self.target(*arguments[:count], **kwargs)
+        if self.asynchronous:
+            return await result  # type: ignore[misc]
+        return result
+
+
+@dataclass(frozen=True)
+class Binding(object):
+    """Memoized outcome of matching a concrete type and label set against the registrations.
+
+    A `list[T]` query without registrations of its own is bound to the candidates of `T`, when there are several of
+    them, and with subtype resolution, a class without registrations of its own is bound to the candidates of its
+    subclasses; the binding is then a fallback.
+
+    Attributes:
+        instances: Supplied instances satisfying the query, in registration order.
+        providers: Providers satisfying the query along with their compiled plans, in registration order.
+        fallback: Whether the candidates are registered under other types: `T` for a `list[T]` query, or subclasses.
+    """
+
+    instances: tuple[object, ...]
+    providers: tuple[tuple[Provider, Plan], ...]
+    fallback: bool = False
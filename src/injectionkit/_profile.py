@@ -0,0 +1,229 @@
+import json
+import os
+import threading
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from typing import final
+
+from ._option import Provider
+from ._trace import TraceEvent, TraceKind, TracePhase, nameof, typename
+
+__all__ = ["ProviderTiming", "StartupReport", "StartupProfiler"]
+
+
+@dataclass(frozen=True)
+class ProviderTiming(object):
+    """Time spent building the instances of a provider, see `StartupReport`.
+
+    Attributes:
+        provider: The provider.
+        name: Qualified name of its factory.
+        calls: Number of calls to the factory.
+        self_time: Time spent in the factory calls, in nanoseconds. Dependencies are built before the factory is
+            called, so they are not included.
+        inclusive_time: Self time of the provider plus the self time of every dependency (direct or not) built during
+            the profile, each counted once, in nanoseconds.
+        dependencies: Indexes (in `StartupReport.timings`) of the direct dependencies built during the profile.
+        critical: Whether the provider is on the critical path.
+    """
+
+    provider: Provider
+    name: str
+    calls: int
+    self_time: int
+    inclusive_time: int
+    dependencies: tuple[int, ...]
+    critical: bool
+
+
+@final
+class StartupReport(object):
+    """Dependency graph of the providers built during a profile, annotated with their build times.
+
+    The critical path is the chain of dependencies with the longest total self time: even with every independent
+    branch built in parallel, startup cannot take less than that chain. Making one of its providers faster, lazy (see
+    `Lazy`) or independent from the others is what shortens startup.
+    """
+
+    timings: tuple[ProviderTiming, ...]
+    """Built providers, each after its dependencies."""
+    critical_path: tuple[int, ...]
+    """Indexes of the providers on the critical path, from the first one built to the last one."""
+
+    def __init__(self, timings: tuple[ProviderTiming, ...], critical_path: tuple[int, ...]) -> None:
+        self.timings = timings
+        self.critical_path = critical_path
+
+    @property
+    def critical_time(self) -> int:
+        """Total self time of the providers on the critical path, in nanoseconds."""
+        return sum(self.timings[index].self_time for index in self.critical_path)
+
+    def to_json(self) -> dict[str, object]:
+        """Return the report as a JSON document, with times in milliseconds."""
+        providers: list[dict[str, object]] = []
+        for index, timing in enumerate(self.timings):
+            record: dict[str, object] = {
+                "id": index,
+                "name": timing.name,
+                "type": typename(timing.provider.concrete_type),
+                "labels": sorted(timing.provider.labels),
+                "lifetime": timing.provider.lifetime.name,
+                "calls": timing.calls,
+                "self_ms": timing.self_time / 1e6,
+                "inclusive_ms": timing.inclusive_time / 1e6,
+                "dependencies": list(timing.dependencies),
+                "critical": timing.critical,
+            }
+            providers.append(record)
+        return {
+            "providers": providers,
+            "critical_path": list(self.critical_path),
+            "critical_ms": self.critical_time / 1e6,
+        }
+
+    def to_dot(self) -> str:
+        """Return the report as a Graphviz DOT graph, the critical path highlighted in red.
+
+        Every provider points to its dependencies, and is labeled with its self and inclusive times.
+        """
+        lines = ["digraph startup {", '    node [shape=box, fontname="Helvetica"];']
+        for index, timing in enumerate(self.timings):
+            self_time = f"self {timing.self_time / 1e6:.3f} ms"
+            inclusive_time = f"inclusive {timing.inclusive_time / 1e6:.3f} ms"
+            label = "\\n".join((timing.name, self_time, inclusive_time))
+            style = ", color=red, penwidth=2" if timing.critical else ""
+            lines.append(f'    p{index} [label="{_escape(label)}"{style}];')
+        critical = set(zip(self.critical_path[1:], self.critical_path))
+        for index, timing in enumerate(self.timings):
+            for dependency in timing.dependencies:
+                style = " [color=red, penwidth=2]" if (index, dependency) in critical else ""
+                lines.append(f"    p{index} -> p{dependency}{style};")
+        lines.append("}")
+        return "\n".join(lines) + "\n"
+
+    def write_json(self, path: str | os.PathLike[str]) -> None:
+        """Write the report as a JSON file, see `to_json`.
+
+        Args:
+            path: Destination file.
+
+        Returns:
+            None
+        """
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.to_json(), file, indent=2)
+
+    def write_dot(self, path: str | os.PathLike[str]) -> None:
+        """Write the report as a DOT file, see `to_dot`.
+
+        Args:
+            path: Destination file.
+
+        Returns:
+            None
+        """
+        with open(path, "w", encoding="utf-8") as file:
+            _ = file.write(self.to_dot())
+
+
+@final
+class StartupProfiler(object):
+    """Hook recording how long every provider takes to build, to find what bounds startup time.
+
+    Install the profiler as a hook (or create the application with `profile=True`), build the application, then call
+    `report` with the dependencies of each provider, e.g. `DependencyContainer.dependencies`.
+    """
+
+    _begins: dict[int, int]
+    _durations: dict[Provider, list[int]]
+    _lock: threading.Lock
+
+    def __init__(self) -> None:
+        self._begins = {}
+        self._durations = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, event: TraceEvent) -> None:
+        if event.kind is not TraceKind.provide or event.provider is None:
+            return
+        with self._lock:
+            if event.phase is TracePhase.begin:
+                self._begins[event.span] = event.timestamp
+                return
+            begin = self._begins.pop(event.span, None)
+            if begin is None:
+                return
+            # Providers are kept in the order their first build ends, which puts dependencies before dependents.
+            durations = self._durations.setdefault(event.provider, [0, 0])
+            durations[0] += 1
+            durations[1] += event.timestamp - begin
+
+    def clear(self) -> None:
+        """Forget the recorded builds, e.g. to profile a later phase on its own.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self._begins.clear()
+            self._durations.clear()
+
+    def report(self, dependencies: Callable[[Provider], Iterable[Provider]]) -> StartupReport:
+        """Build the report of the recorded builds.
+
+        Args:
+            dependencies: Returns the direct dependencies of a provider. Dependencies that were not built during the
+                profile (e.g. suppliers) are left out.
+
+        Returns:
+            The dependency graph of the built providers, annotated with their build times.
+        """
+        with self._lock:
+            durations = {provider: (calls, total) for provider, (calls, total) in self._durations.items()}
+        indexes = {provider: index for index, provider in enumerate(durations)}
+        edges: list[tuple[int, ...]] = []
+        closures: list[set[int]] = []
+        longest: list[int] = []  # self time of the longest chain ending with each provider
+        previous: list[int | None] = []  # previous provider on that chain
+        for index, (provider, (_, total)) in enumerate(durations.items()):
+            direct = tuple(
+                dict.fromkeys(
+                    indexes[dependency]
+                    for dependency in dependencies(provider)
+                    if dependency in indexes and indexes[dependency] < index
+                )
+            )
+            closure = {index}
+            for dependency in direct:
+                closure |= closures[dependency]
+            slowest = max(direct, key=lambda dependency: longest[dependency], default=None)
+            edges.append(direct)
+            closures.append(closure)
+            longest.append(total + (0 if slowest is None else longest[slowest]))
+            previous.append(slowest)
+        path: list[int] = []
+        last = max(range(len(longest)), key=lambda index: longest[index], default=None)
+        while last is not None:
+            path.append(last)
+            last = previous[last]
+        path.reverse()
+        critical = set(path)
+        totals = [total for _, total in durations.values()]
+        timings = tuple(
+            ProviderTiming(
+                provider=provider,
+                name=nameof(provider.factory),
+                calls=calls,
+                self_time=total,
+                inclusive_time=sum(totals[dependency] for dependency in closures[index]),
+                dependencies=edges[index],
+                critical=index in critical,
+            )
+            for index, (provider, (calls, total)) in enumerate(durations.items())
+        )
+        return StartupReport(timings, tuple(path))
+
+
+def _escape(label: str) -> str:
+    return label.replace('"', '\\"')
@@ -0,0 +1,263 @@
+import dataclasses
+import inspect
+import os
+import pickle
+import sys
+import tempfile
+import typing
+from pathlib import Path
+from typing import TypeAlias, final
+
+from .reflect import ConcreteType, Parameter, Signature, Unspecified, signature_cache, signatureof
+
+__all__ = ["RegistryCache"]
+
+_VERSION = 3
+
+_Stamp: TypeAlias = tuple[str, int, int]
+"""Source file of a module, with its modification time (in nanoseconds) and size."""
+
+
+def _key(target: object) -> str | None:
+    module = getattr(target, "__module__", None)
+    qualname = getattr(target, "__qualname__", None)
+    if not isinstance(module, str) or not isinstance(qualname, str) or "<locals>" in qualname:
+        return None
+    return f"{module}:{qualname}"
+
+
+def _stamp(module: str) -> _Stamp | None:
+    filename = getattr(sys.modules.get(module), "__file__", None)
+    if filename is None:
+        return None
+    try:
+        stat = os.stat(filename)
+    except OSError:
+        return None
+    return (filename, stat.st_mtime_ns, stat.st_size)
+
+
+class _Default:
+    """Stands for a default value in cached signatures; the value itself is read from the live callable."""
+
+
+def _function(target: object) -> object:
+    # The function reflected by `signatureof` for a factory or consumer: the constructor of a class, unwrapped.
+    function: object = getattr(target, "__init__") if isinstance(target, type) else target
+    if callable(function):
+        function = inspect.unwrap(function)
+        function = getattr(function, "__func__", function)
+    return function
+
+
+def _annotations(target: object) -> dict[str, object] | None:
+    # Annotations of the reflected function, evaluated, to validate cached signatures: the aliases they use (e.g. with
+    # labels) may come from any module. `None` if they cannot be read or evaluated.
+    function = _function(target)
+    annotations = getattr(function, "__annotations__", None)
+    if not isinstance(annotations, dict):
+        return None
+    if any(isinstance(annotation, str) for annotation in annotations.values()):
+        try:
+            return typing.get_type_hints(function, include_extras=True)
+        except Exception:
+            return None
+    return dict(annotations)
+
+
+def _defaults(target: object) -> dict[str, object] | None:
+    # Default values of the parameters of the reflected function, without reflecting it; `None` if they cannot be read
+    # this way.
+    function = _function(target)
+    code = getattr(function, "__code__", None)
+    if code is None:
+        return None
+    names = code.co_varnames[: code.co_argcount]
+    values = getattr(function, "__defaults__", None) or ()
+    defaults: dict[str, object] = dict(zip(names[len(names) - len(values) :], values))
+    defaults.update(getattr(function, "__kwdefaults__", None) or {})
+    return defaults
+
+
+def _modules(concrete: ConcreteType) -> set[str]:
+    modules = {getattr(concrete.constructor, "__module__", "builtins")}
+    for parameter in concrete.parameters:
+        modules |= _modules(parameter)
+    return modules
+
+
+@final
+class RegistryCache(object):
+    """On-disk cache of the signatures reflected for providers and consumers.
+
+    Reflecting every factory and consumer (`signatureof`, and `typeof` for each of their annotations) is most of the
+    cost of building an `App`. Given a cache file, `App` saves the reflected signatures of its options, and later
+    processes load them back instead of reflecting again. The signatures hold what registrations and plans are built
+    from: the concrete types and labels produced by providers, and the parameters of every factory and consumer.
+
+    Entries are keyed by the import path (`module:qualname`) of the reflected callable, and are only used while the
+    source files of its module and of the modules defining the types in its signature are unchanged (same modification
+    time and size), and while its annotations are equal to the ones it was reflected with, wherever they are defined
+    (e.g. `Annotated` aliases carrying labels). Callables defined inside functions are not cached. Default values are
+    not stored either: they are taken from the callable itself when its signature is loaded, so consumers still receive
+    the very default objects.
+
+    The file is a pickle: only point it at a location that is as trusted as the code itself, like `__pycache__`.
+
+    Attributes:
+        path: Location of the cache file.
+        hits: Number of signatures loaded from the cache.
+        misses: Number of signatures that had to be reflected.
+    """
+
+    path: Path
+    hits: int
+    misses: int
+    _entries: dict[str, tuple[tuple[_Stamp, ...], bytes]]
+    """Per callable: the stamps of its modules, and its pickled annotations and signature."""
+    _dirty: bool
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        """Load the cache file, if it exists and is readable; otherwise start empty.
+
+        Args:
+            path: Location of the cache file.
+
+        Returns:
+            None
+        """
+        self.path = Path(path)
+        self.hits = 0
+        self.misses = 0
+        self._entries = {}
+        self._dirty = False
+        try:
+            with open(self.path, "rb") as file:
+                version, entries = pickle.load(file)
+        except Exception:  # missing, unreadable or corrupted: rebuilt on the next save
+            return
+        if version == _VERSION and isinstance(entries, dict):
+            self._entries = entries
+
+    def preload(self, target: object) -> bool:
+        """Make the cached signature of `target` available to `signatureof`, if its sources are unchanged.
+
+        Args:
+            target: Factory or consumer about to be reflected.
+
+        Returns:
+            Whether the signature was loaded from the cache.
+        """
+        signature = self._load(target)
+        if signature is None:
+            self.misses += 1
+            return False
+        signature_cache.put(target, signature)
+        self.hits += 1
+        return True
+
+    def record(self, target: object) -> None:
+        """Store the signature of `target` (reflecting it if necessary) into the cache, unless it is cached already.
+
+        Args:
+            target: Reflected factory or consumer.
+
+        Returns:
+            None
+        """
+        key = _key(target)
+        if key is None or self._load(target) is not None:
+            return
+        annotations = _annotations(target)
+        if annotations is None:
+            return
+        try:
+            signature = signatureof(target)
+        except Exception:
+            return
+        if isinstance(target, type):
+            # Cached the way `signatureof` caches classes: without the class itself as return type.
+            signature = Signature(signature.parameters, None)
+        defaults = _defaults(target)
+        parameters: list[Parameter] = []
+        for parameter in signature.parameters:
+            if parameter.default_value is not Unspecified:
+                if defaults is None or defaults.get(parameter.name, Unspecified) is not parameter.default_value:
+                    return
+                parameter = dataclasses.replace(parameter, default_value=_Default)
+            parameters.append(parameter)
+        signature = Signature(parameters, signature.returns)
+        modules = {key.partition(":")[0]}
+        for parameter in signature.parameters:
+            modules |= _modules(parameter.typ.concrete)
+        if signature.returns is not None:
+            modules |= _modules(signature.returns.concrete)
+        stamps: list[_Stamp] = []
+        for module in sorted(modules):
+            stamp = _stamp(module)
+            if stamp is not None:
+                stamps.append(stamp)
+            elif module not in sys.builtin_module_names:
+                return
+        try:
+            payload = pickle.dumps((annotations, signature))
+        except Exception:  # e.g. a type that cannot be pickled
+            return
+        self._entries[key] = (tuple(stamps), payload)
+        self._dirty = True
+
+    def save(self) -> None:
+        """Write the cache file if entries were recorded since it was loaded.
+
+        The file is replaced atomically, so concurrent processes never read a partially written cache.
+
+        Returns:
+            None
+        """
+        if not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        descriptor, temporary = tempfile.mkstemp(dir=self.path.parent, prefix=f".{self.path.name}.")
+        try:
+            with os.fdopen(descriptor, "wb") as file:
+                pickle.dump((_VERSION, self._entries), file)
+            os.replace(temporary, self.path)
+        except BaseException:
+            os.unlink(temporary)
+            raise
+        self._dirty = False
+
+    def _load(self, target: object) -> Signature | None:
+        key = _key(target)
+        entry = None if key is None else self._entries.get(key)
+        if entry is None:
+            return None
+        stamps, payload = entry
+        if not all(self._fresh(stamp) for stamp in stamps):
+            return None
+        try:
+            annotations, signature = pickle.loads(payload)
+        except Exception:  # a type of the signature no longer exists
+            return None
+        if annotations != _annotations(target):
+            return None
+        if not any(parameter.default_value is _Default for parameter in signature.parameters):
+            return signature
+        defaults = _defaults(target)
+        parameters: list[Parameter] = []
+        for parameter in signature.parameters:
+            if parameter.default_value is _Default:
+                if defaults is None or parameter.name not in defaults:
+                    return None
+                parameter = dataclasses.replace(parameter, default_value=defaults[parameter.name])
+            parameters.append(parameter)
+        return Signature(parameters, signature.returns)
+
+    @staticmethod
+    def _fresh(stamp: _Stamp) -> bool:
+        filename, mtime, size = stamp
+        try:
+            stat = os.stat(filename)
+        except OSError:
+            return False
+        return stat.st_mtime_ns == mtime and stat.st_size == size
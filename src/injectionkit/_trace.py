@@ -0,0 +1,142 @@
+import itertools
+import json
+import os
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass
+from enum import Enum, auto
+from typing import TypeAlias, final
+
+from ._option import Provider
+from .reflect import ConcreteType
+
+__all__ = ["TracePhase", "TraceKind", "TraceEvent", "Hook", "ChromeTraceExporter"]
+
+
+class TracePhase(Enum):
+    """Whether a trace event opens or closes a span."""
+
+    begin = auto()
+    end = auto()
+
+
+class TraceKind(Enum):
+    """What a traced span measures.
+
+    `reflect` spans cover reflecting options and compiling plans, `provide` spans cover provider factory calls and
+    `consume` spans cover consumer calls.
+    """
+
+    reflect = auto()
+    provide = auto()
+    consume = auto()
+
+
+@dataclass(frozen=True)
+class TraceEvent(object):
+    """Beginning or end of a traced span.
+
+    Attributes:
+        phase: Whether the span begins or ends.
+        kind: What the span measures.
+        span: Identifier shared by the begin and end events of a span.
+        name: Qualified name of the factory, consumer or reflected object.
+        provider: Provider whose factory is called, if any.
+        concrete: Concrete type produced by the provider, if any.
+        labels: Labels carried by the provider, if any.
+        depth: Depth of the provider in the dependency graph; direct dependencies of the resolution are at depth 1.
+        thread: Identifier of the thread emitting the event.
+        timestamp: Time of the event in nanoseconds, from `time.perf_counter_ns`.
+    """
+
+    phase: TracePhase
+    kind: TraceKind
+    span: int
+    name: str
+    provider: Provider | None
+    concrete: ConcreteType | None
+    labels: frozenset[str]
+    depth: int
+    thread: int
+    timestamp: int
+
+
+Hook: TypeAlias = Callable[[TraceEvent], None]
+"""Callback receiving every trace event, installed with `App.add_hook` or `DependencyContainer.add_hook`."""
+
+spans = itertools.count()
+"""Source of span identifiers."""
+
+
+def nameof(target: object) -> str:
+    """Return a readable name for a traced object."""
+    return getattr(target, "__qualname__", None) or repr(target)
+
+
+def typename(concrete: ConcreteType) -> str:
+    name = nameof(concrete.constructor)
+    if concrete.parameters:
+        name += f"[{', '.join(typename(parameter) for parameter in concrete.parameters)}]"
+    return name
+
+
+@final
+class ChromeTraceExporter(object):
+    """Hook collecting trace events in the Chrome trace event format.
+
+    Every span becomes a complete (`"ph": "X"`) event on the thread that emitted it, so the written file can be opened
+    in Perfetto (https://ui.perfetto.dev) or `chrome://tracing`. Install the exporter as a hook, run the application,
+    then call `write`.
+    """
+
+    _events: list[dict[str, object]]
+    _begins: dict[int, TraceEvent]
+    _lock: threading.Lock
+
+    def __init__(self) -> None:
+        self._events = []
+        self._begins = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, event: TraceEvent) -> None:
+        with self._lock:
+            if event.phase is TracePhase.begin:
+                self._begins[event.span] = event
+                return
+            begin = self._begins.pop(event.span, None)
+        if begin is None:
+            return
+        arguments: dict[str, object] = {"depth": begin.depth}
+        if begin.concrete is not None:
+            arguments["type"] = typename(begin.concrete)
+        if begin.labels:
+            arguments["labels"] = sorted(begin.labels)
+        record: dict[str, object] = {
+            "name": begin.name,
+            "cat": begin.kind.name,
+            "ph": "X",
+            "ts": begin.timestamp / 1000,
+            "dur": (event.timestamp - begin.timestamp) / 1000,
+            "pid": os.getpid(),
+            "tid": begin.thread,
+            "args": arguments,
+        }
+        with self._lock:
+            self._events.append(record)
+
+    def trace(self) -> dict[str, object]:
+        """Return the collected spans as a Chrome trace document."""
+        with self._lock:
+            return {"traceEvents": list(self._events), "displayTimeUnit": "ms"}
+
+    def write(self, path: str | os.PathLike[str]) -> None:
+        """Write the collected spans as a Chrome trace JSON file.
+
+        Args:
+            path: Destination file.
+
+        Returns:
+            None
+        """
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.trace(), file)
@@ -1,2 +1,3 @@
+from ._cache import *  # noqa: F403
 from ._function import *  # noqa: F403
 from ._type import *  # noqa: F403
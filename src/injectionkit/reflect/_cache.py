@@ -0,0 +1,96 @@
+import weakref
+from dataclasses import dataclass
+from typing import Generic, TypeVar, final
+
+__all__ = ["CacheInfo", "ReflectionCache"]
+
+_T = TypeVar("_T")
+
+
+@dataclass(frozen=True)
+class CacheInfo(object):
+    """Statistics of a reflection cache.
+
+    Attributes:
+        hits: Number of lookups answered from the cache.
+        misses: Number of lookups that had to be reflected.
+        size: Number of entries currently held by the cache.
+    """
+
+    hits: int
+    misses: int
+    size: int
+
+
+@final
+class ReflectionCache(Generic[_T]):
+    """Memoize reflection results keyed on the reflected object.
+
+    Keys that support weak references (functions, classes, generic aliases) are held weakly, so the entry disappears
+    together with the reflected object and dynamically created types do not leak. Hashable keys that cannot be weakly
+    referenced (e.g. `int | str` or forward reference strings) are held strongly, and unhashable keys are never cached.
+
+    Cached values are shared between callers and must not be mutated.
+    """
+
+    _weak: "weakref.WeakKeyDictionary[object, _T]"
+    _strong: dict[object, _T]
+    _hits: int
+    _misses: int
+
+    def __init__(self) -> None:
+        self._weak = weakref.WeakKeyDictionary()
+        self._strong = {}
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key: object) -> _T | None:
+        """Look up the cached reflection of `key`, counting a hit or a miss.
+
+        Args:
+            key: Reflected object.
+
+        Returns:
+            Cached value, or `None` when `key` has not been reflected yet or cannot be cached.
+        """
+        try:
+            value = self._weak.get(key)
+        except TypeError:
+            try:
+                value = self._strong.get(key)
+            except TypeError:  # unhashable
+                value = None
+        if value is None:
+            self._misses += 1
+        else:
+            self._hits += 1
+        return value
+
+    def put(self, key: object, value: _T) -> None:
+        """Store the reflection of `key`, silently ignoring keys that cannot be cached.
+
+        Args:
+            key: Reflected object.
+            value: Reflection result.
+
+        Returns:
+            None
+        """
+        try:
+            self._weak[key] = value
+        except TypeError:
+            try:
+                self._strong[key] = value
+            except TypeError:  # unhashable
+                pass
+
+    def info(self) -> CacheInfo:
+        """Return the hit/miss counters and the current size of the cache."""
+        return CacheInfo(self._hits, self._misses, len(self._weak) + len(self._strong))
+
+    def clear(self) -> None:
+        """Drop every entry and reset the counters."""
+        self._weak.clear()
+        self._strong.clear()
+        self._hits = 0
+        self._misses = 0
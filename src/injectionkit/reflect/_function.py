@@ -2,6 +2,7 @@ import inspect
 from dataclasses import dataclass
 from enum import Enum, auto
 
+from ._cache import ReflectionCache
 from ._type import Type, typeof
 
 __all__ = [
@@ -11,6 +12,7 @@ __all__ = [
     "Signature",
     "ComplicatedSignatureError",
     "signatureof",
+    "signature_cache",
 ]
 
 
@@ -93,6 +95,9 @@ def signatureof(obj: object) -> Signature:
     Accepts callables or classes, inspects parameter annotations, skips `self` parameters, validates that no variadic
     constructs are used, and returns a `Signature` describing inputs and the optional return type.
 
+    Signatures are memoized in `signature_cache`; the returned `Signature` may be shared with other callers and must not
+    be mutated.
+
     Args:
         obj: Callable or class whose constructor should be reflected.
 
@@ -103,6 +108,25 @@ def signatureof(obj: object) -> Signature:
         TypeError: If the provided object is not callable.
         ComplicatedSignatureError: If the callable uses unsupported variadic parameters.
     """
+    signature = signature_cache.get(obj)
+    if signature is None:
+        signature = _signatureof(obj)
+        if isinstance(obj, type):
+            # The class is the return type of its own constructor. Strip it from the cached value, which would keep the
+            # class alive otherwise.
+            signature_cache.put(obj, Signature(signature.parameters, None))
+        else:
+            signature_cache.put(obj, signature)
+    elif isinstance(obj, type):
+        signature = Signature(signature.parameters, typeof(obj))
+    return signature
+
+
+signature_cache: ReflectionCache[Signature] = ReflectionCache()
+"""Weak-keyed cache of the callables reflected by `signatureof`."""
+
+
+def _signatureof(obj: object) -> Signature:
     returns: Type | None = None
 
     if isinstance(obj, type):
@@ -1,12 +1,15 @@
 import typing
 from dataclasses import dataclass
 
+from ._cache import ReflectionCache
+
 __all__ = [
     "ConcreteType",
     "Type",
     "UnreflectableTypeError",
     "InvalidLabelTypeError",
     "typeof",
+    "type_cache",
     "InvalidAnnotatedTypeError",
 ]
 
@@ -18,8 +21,11 @@ class ConcreteType(object):
     Represents the fully resolved constructor for a dependency along with any nested parameter types extracted from
     typing annotations.
 
+    A `typing.TypeVar` is reflected as a concrete type whose constructor is the type variable itself, e.g. in the
+    return annotation `Repository[T]` of a provider template.
+
     Attributes:
-        constructor: Base Python type that should be instantiated or matched.
+        constructor: Base Python type that should be instantiated or matched, or a type variable.
         parameters: Frozen list of nested `ConcreteType` instances for generic parameters.
     """
 
@@ -83,6 +89,9 @@ def typeof(annotation: object, exist_labels: set[str] | None = None) -> Type:
     Handles plain types, generic aliases, and `typing.Annotated` metadata while recursively parsing nested annotations
     to build complete type descriptors.
 
+    Reflections of generic and annotated types are memoized in `type_cache`; the returned `Type` may be shared with
+    other callers and must not be mutated.
+
     Args:
         annotation: Type annotation to be reflected.
         exist_labels: Optional set of labels carried from the calling context.
@@ -95,6 +104,25 @@ def typeof(annotation: object, exist_labels: set[str] | None = None) -> Type:
         InvalidAnnotatedTypeError: If nested annotated types appear where they are not supported.
         UnreflectableTypeError: If the annotation cannot be converted into a type.
     """
+    if isinstance(annotation, type) and typing.get_origin(annotation) is None:
+        # Plain classes are cheap to reflect. They are not cached, since the cached value would keep them alive.
+        typ = Type(ConcreteType(annotation, ()), set())
+    else:
+        cached = type_cache.get(annotation)
+        if cached is None:
+            cached = _typeof(annotation)
+            type_cache.put(annotation, cached)
+        typ = cached
+    if exist_labels:
+        return Type(typ.concrete, typ.labels | exist_labels)
+    return typ
+
+
+type_cache: ReflectionCache[Type] = ReflectionCache()
+"""Weak-keyed cache of the annotations reflected by `typeof`."""
+
+
+def _typeof(annotation: object) -> Type:
     origin = typing.get_origin(annotation)
     if origin == typing.Annotated:
         # Annotated type
@@ -107,12 +135,9 @@ def typeof(annotation: object, exist_labels: set[str] | None = None) -> Type:
         for label in args[1:]:
             if not isinstance(label, str):
                 raise InvalidLabelTypeError(label)
-        labels = set(args[1:])
-        if exist_labels is not None:
-            labels |= exist_labels
-        return Type(concrete, labels)
+        return Type(concrete, set(args[1:]))
     else:
-        return Type(_concrete_typeof(annotation), exist_labels or set())
+        return Type(_concrete_typeof(annotation), set())
 
 
 class InvalidAnnotatedTypeError(Exception):
@@ -139,6 +164,8 @@ def _concrete_typeof(annotation: object) -> ConcreteType:
         # Simple type
         #
         # e.g. `int`, `str`. No labels, no generics, just return it as is.
+        if isinstance(annotation, typing.TypeVar):
+            return ConcreteType(typing.cast(type, annotation), ())
         if not isinstance(annotation, type):
             raise UnreflectableTypeError(annotation)
         return ConcreteType(annotation, ())
@@ -0,0 +1,23 @@
+import sys
+from collections.abc import Callable
+from pathlib import Path
+
+import pytest
+
+
+@pytest.fixture
+def write_module(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Callable[[str, str], Path]:
+    """Write modules that can be imported during the test.
+
+    Call the fixture with the name and the source of a module; it returns the source file. A module of the same name
+    imported before is forgotten, so that the next import loads the written source.
+    """
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    def write(name: str, source: str) -> Path:
+        path = tmp_path / f"{name}.py"
+        _ = path.write_text(source)
+        monkeypatch.delitem(sys.modules, name, raising=False)
+        return path
+
+    return write
@@ -0,0 +1,80 @@
+import asyncio
+from dataclasses import dataclass
+from typing import Annotated
+
+import pytest
+
+from injectionkit import App, AsyncApp, AsyncResolutionError, Consumer, Provider, Supplier
+
+
+@dataclass(frozen=True)
+class Pool(object):
+    dsn: str
+
+
+@dataclass(frozen=True)
+class Client(object):
+    url: str
+
+
+def test_async_app() -> None:
+    """
+    `AsyncApp` accepts coroutine functions as providers and consumers, and builds independent branches concurrently.
+    """
+
+    started: list[str] = []
+
+    async def pool(dsn: Annotated[str, "dsn"]) -> Pool:
+        started.append("pool")
+        await asyncio.sleep(0.01)
+        # Both branches have started before either of them is finished.
+        assert started == ["pool", "client"]
+        return Pool(dsn)
+
+    async def client(url: Annotated[str, "url"]) -> Client:
+        started.append("client")
+        await asyncio.sleep(0.01)
+        return Client(url)
+
+    async def check(pool: Pool, client: Client, names: list[str]) -> None:
+        assert pool == Pool("postgres://")
+        assert client == Client("https://")
+        assert names == ["Cylix", "Lee"]
+
+    app = AsyncApp(
+        Provider(pool),
+        Provider(client),
+        Supplier("postgres://", regard=Annotated[str, "dsn"]),
+        Supplier("https://", regard=Annotated[str, "url"]),
+        Supplier("Cylix"),
+        Supplier("Lee"),
+        Consumer(check),
+    )
+    asyncio.run(app.run())
+
+
+def test_async_singleton() -> None:
+    """
+    A singleton required concurrently by several branches is built once.
+    """
+
+    built: list[Pool] = []
+
+    async def pool() -> Pool:
+        await asyncio.sleep(0.01)
+        built.append(Pool("postgres://"))
+        return built[-1]
+
+    def check(first: Pool, second: Pool) -> None:
+        assert first is second
+
+    asyncio.run(AsyncApp(Provider(pool, singleton=True), Consumer(check)).run())
+    assert len(built) == 1
+
+
+def test_sync_app_rejects_coroutines() -> None:
+    async def pool() -> Pool:
+        return Pool("postgres://")
+
+    with pytest.raises(AsyncResolutionError):
+        _ = App(Provider(pool)).resolve(Pool)
@@ -0,0 +1,46 @@
+from dataclasses import dataclass
+
+from injectionkit import App, Provider, Supplier
+
+
+class Connection(object):
+    pass
+
+
+@dataclass(frozen=True)
+class Users(object):
+    connection: Connection
+
+
+@dataclass(frozen=True)
+class Orders(object):
+    connection: Connection
+
+
+def test_resolve_many() -> None:
+    """
+    `resolve_many` resolves several annotations in one session: the transient dependency they share (the bottom of the
+    diamond) is built once for the batch, and once per annotation with `resolve`.
+    """
+
+    connections: list[Connection] = []
+
+    def connection() -> Connection:
+        connections.append(Connection())
+        return connections[-1]
+
+    app = App(Provider(connection), Provider(Users), Provider(Orders), Supplier("sqlite://"))
+    users, orders, url = app.resolve_many(Users, Orders, str)
+    assert isinstance(users, Users) and isinstance(orders, Orders)
+    assert users.connection is orders.connection
+    assert url == "sqlite://"
+    assert len(connections) == 1
+
+    # Every batch is a new session.
+    users, orders = app.resolve_many(Users, Orders)
+    assert isinstance(users, Users) and isinstance(orders, Orders)
+    assert users.connection is orders.connection is connections[-1]
+    assert len(connections) == 2
+
+    users, orders = app.resolve(Users), app.resolve(Orders)
+    assert len(connections) == 4
@@ -0,0 +1,79 @@
+from dataclasses import dataclass
+from typing import Annotated
+
+from injectionkit import App, Consumer, Lazy, Provider, Supplier
+
+
+@dataclass(frozen=True)
+class Config(object):
+    url: str
+
+
+@dataclass(frozen=True)
+class Database(object):
+    config: Config
+
+
+@dataclass(frozen=True)
+class Service(object):
+    database: Database
+    plugins: list[str]
+    retries: int
+
+
+def test_codegen() -> None:
+    """
+    With `codegen=True`, graphs are executed by generated code, which resolves exactly like the interpreted execution.
+    """
+
+    configs: list[Config] = []
+
+    def config() -> Config:
+        configs.append(Config("sqlite://"))
+        return configs[-1]
+
+    def database(config: Config, /) -> Database:
+        return Database(config)
+
+    def service(database: Database, *, plugins: Annotated[list[str], "plugin"], retries: int = 3) -> Service:
+        return Service(database, plugins, retries)
+
+    def check(first: Service, second: Service, lazy: Lazy[Database]) -> None:
+        assert first is not second
+        assert first.database is second.database is lazy.get()
+        assert first.plugins == ["a", "b"]
+        assert first.retries == 3
+
+    app = App(
+        Provider(config),
+        Provider(database, singleton=True),
+        Provider(service),
+        Supplier("a", regard=Annotated[str, "plugin"]),
+        Supplier("b", regard=Annotated[str, "plugin"]),
+        Consumer(check),
+        codegen=True,
+    )
+    app.run()
+    app.run()
+    # The configuration is only needed to build the singleton database, once.
+    assert len(configs) == 1
+
+
+def test_deep_codegen() -> None:
+    """
+    Generated code is straight-line, so long chains compile without nesting.
+    """
+
+    types: list[type] = [int]
+    options: list[Provider] = []
+    for depth in range(2000):
+
+        def factory(value: object) -> object:
+            return value
+
+        factory.__annotations__ = {"value": types[-1], "return": type(f"T{depth}", (), {})}
+        types.append(factory.__annotations__["return"])
+        options.append(Provider(factory, singleton=depth % 2 == 0))
+    app = App(Supplier(42), *options, codegen=True)
+    assert app.resolve(types[-1]) == 42
+    assert app.resolve(types[-1]) == 42
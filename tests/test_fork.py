@@ -0,0 +1,58 @@
+import os
+from dataclasses import dataclass
+
+import pytest
+
+from injectionkit import App, Provider
+
+
+class Tokenizer(object):
+    def __init__(self) -> None:
+        pass
+
+
+class Connection(object):
+    def __init__(self) -> None:
+        pass
+
+
+@dataclass(frozen=True)
+class Repository(object):
+    connection: Connection
+    tokenizer: Tokenizer
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires `os.fork`")
+def test_fork() -> None:
+    """
+    Forked children keep the fork-safe singletons built by `warmup`, and rebuild fork-unsafe singletons along with the
+    singletons depending on them.
+    """
+
+    built: list[type] = []
+
+    def build_tokenizer() -> Tokenizer:
+        built.append(Tokenizer)
+        return Tokenizer()
+
+    app = App(
+        Provider(build_tokenizer, singleton=True),
+        Provider(Connection, singleton=True, fork_safe=False),
+        Provider(Repository, singleton=True),
+    )
+    app.warmup()
+    assert built == [Tokenizer]
+    tokenizer, connection, repository = app.resolve_many(Tokenizer, Connection, Repository)
+
+    pid = os.fork()
+    if pid == 0:  # pragma: no cover - checked through the exit status
+        try:
+            intact = app.resolve(Tokenizer) is tokenizer
+            rebuilt = app.resolve(Connection) is not connection and app.resolve(Repository) is not repository
+            os._exit(0 if intact and rebuilt else 1)
+        except BaseException:
+            os._exit(2)
+    _, status = os.waitpid(pid, 0)
+    assert os.waitstatus_to_exitcode(status) == 0
+    # The parent process is unaffected.
+    assert app.resolve(Connection) is connection
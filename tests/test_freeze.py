@@ -0,0 +1,69 @@
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+import pytest
+
+from injectionkit import App, Consumer, FrozenContainerError, Provider, Supplier
+from injectionkit.reflect import ComplicatedSignatureError
+
+
+@dataclass(frozen=True)
+class Config(object):
+    url: str
+
+
+@dataclass(frozen=True)
+class Database(object):
+    config: Config
+
+
+def test_freeze() -> None:
+    """
+    A frozen application rejects new options, but keeps resolving the registered ones.
+    """
+
+    app = App(Supplier(Config("sqlite://")), Provider(Database))
+    app.freeze()
+    assert app.frozen
+    with pytest.raises(FrozenContainerError):
+        app.add(Supplier(42))
+    with pytest.raises(FrozenContainerError):
+        app.add(Consumer(print))
+    database = app.resolve(Database)
+    assert isinstance(database, Database)
+    assert database.config.url == "sqlite://"
+
+
+def test_unreflectable_consumer() -> None:
+    """
+    Consumers whose signature cannot be reflected do not prevent freezing; they fail when they are run, as usual.
+    """
+
+    def report(*databases: Database) -> None:
+        pass
+
+    app = App(Supplier(Config("sqlite://")), Provider(Database), Consumer(report))
+    app.freeze()
+    assert app.frozen
+    assert isinstance(app.resolve(Database), Database)
+    with pytest.raises(ComplicatedSignatureError):
+        app.run()
+
+
+def test_concurrent_resolution() -> None:
+    """
+    Many threads can share a frozen application; singletons are still built exactly once.
+    """
+
+    built: list[Config] = []
+
+    def config() -> Config:
+        built.append(Config("sqlite://"))
+        return built[-1]
+
+    app = App(Provider(config, singleton=True), Provider(Database))
+    app.freeze()
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        databases = list(executor.map(lambda _: app.resolve(Database), range(1000)))
+    assert len(built) == 1
+    assert all(isinstance(database, Database) and database.config is built[0] for database in databases)
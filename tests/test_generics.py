@@ -0,0 +1,62 @@
+from typing import Annotated, Generic, TypeVar
+
+from injectionkit import App, DependencyContainer, Provider, Supplier
+
+T = TypeVar("T")
+
+
+class User(object):
+    pass
+
+
+class Order(object):
+    pass
+
+
+class Repository(Generic[T]):
+    model: type[T]
+    url: str
+
+    def __init__(self, model: type[T], url: str) -> None:
+        self.model = model
+        self.url = url
+
+
+def repository(model: type[T], url: str) -> Repository[T]:
+    return Repository(model, url)
+
+
+def test_templates() -> None:
+    """
+    A provider producing `Repository[T]` is specialized for every `Repository[...]` requested, and receives the class
+    bound to `T` through its `type[T]` parameter.
+    """
+
+    app = App(Supplier("sqlite://"), Provider(repository, singleton=True))
+    users = app.resolve(Repository[User])
+    orders = app.resolve(Repository[Order])
+    assert isinstance(users, Repository) and isinstance(orders, Repository)
+    assert (users.model, orders.model) == (User, Order)
+    assert users.url == "sqlite://"
+    # Each specialization is a singleton of its own.
+    assert app.resolve(Repository[User]) is users
+
+
+def test_exact_precedence() -> None:
+    """
+    Providers registered for a specific type take precedence over templates, and labels of templates apply.
+    """
+
+    def labeled(model: type[T]) -> Annotated[Repository[T], "cached"]:
+        return Repository(model, "memory://")
+
+    container = DependencyContainer()
+    container.register(Supplier("sqlite://"))
+    container.register(Provider(repository))
+    container.register(Provider(labeled))
+    users = container.resolve(Annotated[Repository[User], "cached"])
+    assert isinstance(users, Repository) and users.url == "memory://"
+
+    container.register(Supplier(Repository(User, "postgres://"), regard=Repository[User]))
+    users = container.resolve(Repository[User])
+    assert isinstance(users, Repository) and users.url == "postgres://"
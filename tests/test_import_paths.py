@@ -0,0 +1,57 @@
+import sys
+from collections.abc import Callable
+from pathlib import Path
+
+import pytest
+
+from injectionkit import App, InvalidProviderFactoryError, Provider
+
+MODULE = """
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class Greeting(object):
+    text: str
+
+
+def greeting(name: str) -> Greeting:
+    return Greeting(f"Hello, {name}!")
+"""
+
+
+@pytest.fixture
+def module(write_module: Callable[[str, str], Path]) -> str:
+    _ = write_module("lazy_greetings", MODULE)
+    return "lazy_greetings"
+
+
+class Greeting(object):
+    """Stand-in for the produced type, so that registering doesn't import the module."""
+
+
+def test_import_path(module: str) -> None:
+    """
+    A factory given as an import path is only imported when the type it produces is resolved for the first time.
+    """
+
+    app = App(Provider(f"{module}:greeting", regard=Greeting), Provider(lambda: "Lee", regard=str))
+    assert module not in sys.modules
+    greeting = app.resolve(Greeting)
+    assert module in sys.modules
+    assert getattr(greeting, "text") == "Hello, Lee!"
+
+
+def test_import_path_without_regard(module: str) -> None:
+    """
+    Without `regard`, the module is imported right away to reflect the return annotation of the factory.
+    """
+
+    provider = Provider(f"{module}.greeting")
+    assert provider.concrete_type.constructor is sys.modules[module].Greeting
+
+
+def test_invalid_import_path() -> None:
+    app = App(Provider("injectionkit_missing_module:factory", regard=Greeting))
+    with pytest.raises(InvalidProviderFactoryError):
+        _ = app.resolve(Greeting)
@@ -86,3 +86,25 @@ def test_multi_labels() -> None:
         Supplier("Lee", regard=Annotated[str, "a", "b", "c"]),  # CONTAINS "a" and "b", passed in.
         Consumer(hello),
     ).run()
+
+
+def test_many_labels() -> None:
+    """
+    Lookups among many labeled values of the same type only return the values containing every requested label, in
+    registration order.
+    """
+
+    def check(
+        evens: Annotated[list[int], "even"],
+        big_evens: Annotated[list[int], "even", "big"],
+        unlabeled: int,
+    ) -> None:
+        assert evens == list(range(0, 100, 2))
+        assert big_evens == list(range(50, 100, 2))
+        assert unlabeled == -1
+
+    options: list[Supplier] = [Supplier(-1)]
+    for number in range(100):
+        labels = ("even" if number % 2 == 0 else "odd", "big" if number >= 50 else "small")
+        options.append(Supplier(number, regard=Annotated[int, labels[0], labels[1]]))
+    App(*options, Consumer(check)).run()
@@ -0,0 +1,75 @@
+import asyncio
+from dataclasses import dataclass
+from typing import Annotated
+
+import pytest
+
+from injectionkit import App, AsyncApp, Consumer, Lazy, MissingDependencyError, Provider, Supplier
+
+
+@dataclass(frozen=True)
+class Model(object):
+    name: str
+
+
+def test_lazy() -> None:
+    """
+    A `Lazy[T]` parameter receives a handle, and `T` is only built when the handle is first accessed.
+    """
+
+    built: list[Model] = []
+
+    def model(name: Annotated[str, "model"]) -> Model:
+        built.append(Model(name))
+        return built[-1]
+
+    def check(model: Lazy[Model], name: Annotated[Lazy[str], "model"]) -> None:
+        assert not built
+        assert model.get() is model.get()
+        assert model.get().name == name.get() == "gpt"
+
+    App(Provider(model), Supplier("gpt", regard=Annotated[str, "model"]), Consumer(check)).run()
+    assert len(built) == 1
+
+
+@dataclass(frozen=True)
+class Parent(object):
+    child: object
+
+
+@dataclass(frozen=True)
+class Child(object):
+    parent: Lazy[Parent]
+
+
+def test_lazy_cycle() -> None:
+    """
+    Depending on something through `Lazy` doesn't close a dependency cycle, since it is resolved later.
+    """
+
+    def parent(child: Child) -> Parent:
+        return Parent(child)
+
+    app = App(Provider(parent, singleton=True), Provider(Child), validate=True)
+    resolved = app.resolve(Parent)
+    assert isinstance(resolved, Parent)
+    assert isinstance(resolved.child, Child)
+    assert resolved.child.parent.get() is resolved
+
+
+def test_lazy_missing() -> None:
+    def check(model: Lazy[Model]) -> None:
+        pass
+
+    with pytest.raises(MissingDependencyError):
+        App(Consumer(check)).run()
+
+
+def test_lazy_async() -> None:
+    async def model() -> Model:
+        return Model("gpt")
+
+    async def check(model: Lazy[Model]) -> None:
+        assert (await model.get_async()).name == "gpt"
+
+    asyncio.run(AsyncApp(Provider(model), Consumer(check)).run())
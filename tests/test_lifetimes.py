@@ -0,0 +1,65 @@
+from dataclasses import dataclass
+
+import pytest
+
+from injectionkit import App, Consumer, DependencyContainer, Lifetime, Provider
+
+
+@dataclass
+class Pool(object):
+    pass
+
+
+@dataclass
+class Session(object):
+    pool: Pool
+
+
+def test_singleton() -> None:
+    """
+    A singleton provider is called at most once per App, no matter how many consumers require it.
+    """
+
+    built: list[Pool] = []
+
+    def pool() -> Pool:
+        built.append(Pool())
+        return built[-1]
+
+    def check(first: Pool, second: Pool) -> None:
+        assert first is second
+
+    App(Provider(pool, singleton=True), Consumer(check), Consumer(check)).run()
+    assert len(built) == 1
+
+
+def test_transient() -> None:
+    """
+    Transient providers, the default, are called for every injection.
+    """
+
+    def check(first: Session, second: Session) -> None:
+        assert first is not second
+        assert first.pool is second.pool
+
+    App(Provider(Pool, lifetime=Lifetime.singleton), Provider(Session), Consumer(check)).run()
+
+
+def test_scoped() -> None:
+    """
+    Scoped instances are shared inside a scope, while every scope builds its own.
+    """
+
+    container = DependencyContainer()
+    container.register(Provider(Pool, singleton=True))
+    container.register(Provider(Session, lifetime=Lifetime.scoped))
+
+    first, second = container.child(), container.child()
+    assert first.resolve(Session) is first.resolve(Session)
+    assert first.resolve(Session) is not second.resolve(Session)
+    assert first.resolve(Pool) is second.resolve(Pool) is container.resolve(Pool)
+
+
+def test_conflicting_lifetime() -> None:
+    with pytest.raises(ValueError):
+        _ = Provider(Pool, singleton=True, lifetime=Lifetime.scoped)
@@ -0,0 +1,51 @@
+import gc
+import weakref
+from dataclasses import dataclass
+
+from injectionkit import App, Consumer, Provider, Supplier
+
+
+class Payload(object):
+    pass
+
+
+@dataclass(frozen=True)
+class Service(object):
+    payload: Payload
+
+
+def test_apps_are_collected() -> None:
+    """
+    Neither the options nor the `App` they were registered into outlive the application.
+    """
+
+    def check(service: Service) -> None:
+        pass
+
+    apps: list[weakref.ref[App]] = []
+    payloads: list[weakref.ref[Payload]] = []
+    for _ in range(10):
+        payload = Payload()
+        app = App(Supplier(payload), Provider(Service, singleton=True), Consumer(check))
+        app.run()
+        apps.append(weakref.ref(app))
+        payloads.append(weakref.ref(payload))
+        del app, payload
+    _ = gc.collect()
+    assert all(app() is None for app in apps)
+    assert all(payload() is None for payload in payloads)
+
+
+def test_close() -> None:
+    """
+    `close` releases the options and instances of an application that is still referenced.
+    """
+
+    payload = Payload()
+    app = App(Supplier(payload), Provider(Service, singleton=True))
+    _ = app.resolve(Service)
+    reference = weakref.ref(payload)
+    del payload
+    app.close()
+    _ = gc.collect()
+    assert reference() is None
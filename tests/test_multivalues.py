@@ -1,4 +1,4 @@
-from injectionkit import App, Consumer, Provider, Supplier
+from injectionkit import App, Consumer, DependencyContainer, Provider, Supplier
 
 
 def test_multivalues() -> None:
@@ -29,3 +29,36 @@ def test_multivalues() -> None:
         Supplier("Cylix"),
         Consumer(check),
     ).run()
+
+
+def test_memoized_multivalues() -> None:
+    """
+    The candidates of a `list[T]` resolution are memoized, and registering another `T` refreshes them.
+    """
+
+    container = DependencyContainer()
+    container.register(Supplier("Cylix"))
+    container.register(Supplier("Lee"))
+    assert container.resolve(list[str]) == ["Cylix", "Lee"]
+    assert container.resolve(list[str]) == ["Cylix", "Lee"]
+
+    container.register(Supplier("Jr."))
+    assert container.resolve(list[str]) == ["Cylix", "Lee", "Jr."]
+
+    # Scopes see the candidates registered into them as well.
+    scope = container.child()
+    scope.register(Supplier("III"))
+    assert scope.resolve(list[str]) == ["Cylix", "Lee", "Jr.", "III"]
+    assert container.resolve(list[str]) == ["Cylix", "Lee", "Jr."]
+
+    # Graphs expanded while a single candidate (or none) was registered are refreshed as well.
+    greeted: list[list[str]] = []
+
+    def greet(names: list[str] = ["nobody"]) -> None:
+        greeted.append(names)
+
+    app = App(Supplier("Cylix"), Consumer(greet))
+    app.run()
+    app.add(Supplier("Lee"))
+    app.run()
+    assert greeted == [["nobody"], ["Cylix", "Lee"]]
@@ -0,0 +1,102 @@
+import threading
+import time
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+import pytest
+
+from injectionkit import App, CircularDependencyError, Consumer, Lazy, Provider
+
+
+@dataclass(frozen=True)
+class Config(object):
+    pass
+
+
+@dataclass(frozen=True)
+class Channel(object):
+    config: Config
+
+
+@dataclass(frozen=True)
+class Table(object):
+    config: Config
+
+
+def test_parallel() -> None:
+    """
+    With an executor, providers that don't depend on each other are built concurrently, and a singleton required by
+    several of them is built exactly once.
+    """
+
+    barrier = threading.Barrier(2, timeout=5)
+    configs: list[Config] = []
+
+    def config() -> Config:
+        time.sleep(0.01)
+        configs.append(Config())
+        return configs[-1]
+
+    # Each of these providers blocks until the other one has started, which only works if they run in parallel.
+    def channel(config: Config) -> Channel:
+        _ = barrier.wait()
+        return Channel(config)
+
+    def table(config: Config) -> Table:
+        _ = barrier.wait()
+        return Table(config)
+
+    def check(channel: Channel, table: Table) -> None:
+        assert channel.config is table.config
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        App(
+            Provider(config, singleton=True),
+            Provider(channel),
+            Provider(table),
+            Consumer(check),
+            executor=executor,
+        ).run()
+    assert len(configs) == 1
+
+
+def test_parallel_cycle() -> None:
+    def channel(table: Table) -> Channel:
+        return Channel(table.config)
+
+    def table(channel: Channel) -> Table:
+        return Table(channel.config)
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        app = App(Provider(channel), Provider(table), executor=executor)
+        with pytest.raises(CircularDependencyError):
+            _ = app.resolve(Channel)
+
+
+class Leaf(object):
+    def __init__(self) -> None:
+        pass
+
+
+class Branch(object):
+    def __init__(self, leaf: Lazy[Leaf]) -> None:
+        self.leaf = leaf.get()
+
+
+class Stream(object):
+    def __init__(self, leaves: Iterator[Leaf]) -> None:
+        self.leaves = list(leaves)
+
+
+def test_nested_resolution() -> None:
+    """
+    Resolutions nested in a factory running on the executor (`Lazy.get`, streams) build inline instead of waiting for
+    the executor, which would deadlock once every thread of the executor waits.
+    """
+
+    with ThreadPoolExecutor(1) as executor:
+        app = App(Provider(Leaf), Provider(Branch), Provider(Stream), executor=executor)
+        branch, stream = app.resolve(Branch), app.resolve(Stream)
+    assert isinstance(branch, Branch) and isinstance(branch.leaf, Leaf)
+    assert isinstance(stream, Stream) and len(stream.leaves) == 1
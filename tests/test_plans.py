@@ -0,0 +1,56 @@
+import pytest
+
+from injectionkit import App, Consumer, DependencyContainer, Provider, Supplier, reflect
+
+
+def test_reflect_once(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Factories are reflected once, and later resolutions just execute the compiled plans.
+    """
+
+    reflected: list[object] = []
+    signatureof = reflect.signatureof
+
+    def counting_signatureof(obj: object) -> reflect.Signature:
+        reflected.append(obj)
+        return signatureof(obj)
+
+    monkeypatch.setattr("injectionkit._plan.signatureof", counting_signatureof)
+
+    def greeting(name: str) -> bytes:
+        return f"Hello, {name}!".encode()
+
+    container = DependencyContainer()
+    container.register(Supplier("Cylix"))
+    container.register(Provider(greeting))
+    for _ in range(3):
+        assert container.resolve(bytes) == b"Hello, Cylix!"
+    assert reflected == [greeting]
+
+
+def test_invalidation() -> None:
+    """
+    Registering an option drops the memoized bindings of its type, so new options are seen by later resolutions.
+    """
+
+    def count(numbers: list[int]) -> None:
+        counts.append(len(numbers))
+
+    counts: list[int] = []
+    app = App(Supplier(1), Supplier(2), Consumer(count))
+    app.run()
+    app.add(Supplier(3))
+    app.run()
+    assert counts == [2, 3]
+
+
+def test_default_value() -> None:
+    """
+    Parameters with default values are injected when the dependency is registered, and defaulted otherwise.
+    """
+
+    def check(age: int = 0, name: str = "nobody") -> None:
+        assert age == 23
+        assert name == "nobody"
+
+    App(Supplier(23), Consumer(check)).run()
@@ -0,0 +1,132 @@
+import asyncio
+import json
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+import pytest
+
+from injectionkit import App, AsyncApp, DependencyContainer, Provider, StartupProfiler, Supplier
+
+
+@dataclass(frozen=True)
+class Config(object):
+    url: str
+
+
+@dataclass(frozen=True)
+class Database(object):
+    config: Config
+
+
+@dataclass(frozen=True)
+class Cache(object):
+    config: Config
+
+
+@dataclass(frozen=True)
+class Service(object):
+    database: Database
+    cache: Cache
+
+
+def config() -> Config:
+    return Config("sqlite://")
+
+
+def database(config: Config) -> Database:
+    time.sleep(0.02)
+    return Database(config)
+
+
+def cache(config: Config) -> Cache:
+    return Cache(config)
+
+
+def service(database: Database, cache: Cache) -> Service:
+    return Service(database, cache)
+
+
+def test_critical_path() -> None:
+    """
+    The critical path follows the slowest chain of dependencies, and inclusive times add up the dependencies.
+    """
+
+    app = App(
+        Provider(config, singleton=True),
+        Provider(database, singleton=True),
+        Provider(cache, singleton=True),
+        Provider(service, singleton=True),
+        profile=True,
+    )
+    _ = app.resolve(Service)
+    report = app.startup_report()
+    names = [timing.name for timing in report.timings]
+    assert names.index("config") < names.index("database") < names.index("service")
+    assert [names[index] for index in report.critical_path] == ["config", "database", "service"]
+    timings = {timing.name: timing for timing in report.timings}
+    assert timings["database"].self_time >= 20_000_000
+    assert timings["service"].inclusive_time == sum(timing.self_time for timing in report.timings)
+    assert timings["cache"].inclusive_time == timings["cache"].self_time + timings["config"].self_time
+    assert not timings["cache"].critical
+    assert sorted(names[index] for index in timings["service"].dependencies) == ["cache", "database"]
+    assert report.critical_time <= timings["service"].inclusive_time
+
+
+def test_reports(tmp_path: Path) -> None:
+    app = App(Supplier(Config("sqlite://")), Provider(database), Provider(cache), Provider(service), profile=True)
+    _ = app.resolve(Service)
+    _ = app.resolve(Service)
+    report = app.startup_report()
+    app.startup_report().write_json(tmp_path / "startup.json")
+    document = json.loads((tmp_path / "startup.json").read_text())
+    assert document == report.to_json()
+    providers = {provider["name"]: provider for provider in document["providers"]}
+    assert set(providers) == {"database", "cache", "service"}
+    assert providers["database"]["calls"] == 2
+    assert providers["database"]["type"].endswith("Database")
+    assert providers["service"]["dependencies"] == [providers["database"]["id"], providers["cache"]["id"]]
+
+    report.write_dot(tmp_path / "startup.dot")
+    dot = (tmp_path / "startup.dot").read_text()
+    assert dot.startswith("digraph startup {")
+    database_id, service_id = providers["database"]["id"], providers["service"]["id"]
+    assert f"p{service_id} -> p{database_id} [color=red, penwidth=2];" in dot
+
+
+def test_async_profile() -> None:
+    async def slow(config: Config) -> Database:
+        await asyncio.sleep(0.02)
+        return Database(config)
+
+    async def main() -> None:
+        app = AsyncApp(Provider(config), Provider(slow), Provider(cache), Provider(service), profile=True)
+        _ = await app.resolve(Service)
+        report = app.startup_report()
+        assert [report.timings[index].name for index in report.critical_path] == [
+            "config",
+            "test_async_profile.<locals>.slow",
+            "service",
+        ]
+
+    asyncio.run(main())
+
+
+def test_profiler_hook() -> None:
+    """
+    The profiler can also be installed as a hook on a container, reporting with the container's dependencies.
+    """
+
+    profiler = StartupProfiler()
+    container = DependencyContainer()
+    container.add_hook(profiler)
+    container.register(Provider(config))
+    container.register(Provider(cache))
+    _ = container.resolve(Cache)
+    report = profiler.report(container.dependencies)
+    assert [timing.name for timing in report.timings] == ["config", "cache"]
+    profiler.clear()
+    assert profiler.report(container.dependencies).timings == ()
+
+    with pytest.raises(RuntimeError):
+        _ = App().startup_report()
@@ -0,0 +1,63 @@
+import gc
+import weakref
+from typing import Annotated
+
+from injectionkit import Provider, Supplier
+from injectionkit.reflect import signature_cache, signatureof, type_cache, typeof
+
+
+def test_hits() -> None:
+    """
+    Reflecting the same callable or annotation again is answered from the caches.
+    """
+
+    def factory(name: Annotated[str, "name"]) -> list[str]:
+        return [name]
+
+    signature = signatureof(factory)
+    hits = signature_cache.info().hits
+    assert signatureof(factory) is signature
+    assert signature_cache.info().hits == hits + 1
+
+    typ = typeof(Annotated[str, "name"])
+    hits = type_cache.info().hits
+    assert typeof(Annotated[str, "name"]) is typ
+    assert type_cache.info().hits == hits + 1
+
+
+def test_no_leak() -> None:
+    """
+    Reflected classes and functions are held weakly, so dynamically created ones can still be garbage-collected.
+    """
+
+    class Dynamic(object):
+        def __init__(self, value: list[int]) -> None:
+            self.value = value
+
+    def factory(value: int) -> Dynamic:
+        return Dynamic([value])  # noqa: F821 (deleted below, to check that it is collected)
+
+    assert signatureof(Dynamic).returns == typeof(Dynamic)
+    assert signatureof(factory).returns == typeof(Dynamic)
+    dynamic, function = weakref.ref(Dynamic), weakref.ref(factory)
+    del Dynamic, factory
+    _ = gc.collect()
+    assert dynamic() is None
+    assert function() is None
+
+
+def test_shared_labels() -> None:
+    """
+    Labels handed out by providers and suppliers are their own, so changing them leaves the cached reflections intact.
+    """
+
+    def factory() -> Annotated[str, "shared"]:
+        return "value"
+
+    provider = Provider(factory)
+    provider.labels.add("mutated")
+    supplier = Supplier("value", regard=Annotated[str, "shared"])
+    supplier.labels.add("mutated")
+    assert Provider(factory).labels == {"shared"}
+    assert Supplier("other", regard=Annotated[str, "shared"]).labels == {"shared"}
+    assert typeof(Annotated[str, "shared"]).labels == {"shared"}
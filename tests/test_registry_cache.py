@@ -0,0 +1,142 @@
+import inspect
+import os
+import sys
+from collections.abc import Callable
+from pathlib import Path
+from typing import Annotated
+
+import pytest
+
+from injectionkit import App, Consumer, Option, Provider, RegistryCache, Supplier
+from injectionkit.reflect import signature_cache
+
+MODULE = """
+from dataclasses import dataclass
+from typing import Annotated
+
+
+@dataclass(frozen=True)
+class Config(object):
+    url: str
+
+
+class Database(object):
+    def __init__(self, config: Config, retries: int = 3) -> None:
+        self.config = config
+        self.retries = retries
+
+
+def config() -> Annotated[Config, "primary"]:
+    return Config("sqlite://")
+
+
+def database(config: Annotated[Config, "primary"]) -> Database:
+    return Database(config)
+
+
+def check(database: Database) -> None:
+    assert database.config.url == "sqlite://"
+
+
+class Options(object):
+    def __init__(self) -> None:
+        pass
+
+
+DEFAULT_OPTIONS = Options()
+received: list[Options] = []
+
+
+def configure(options: Options = DEFAULT_OPTIONS) -> None:
+    received.append(options)
+"""
+
+
+@pytest.fixture
+def module(write_module: Callable[[str, str], Path]) -> Path:
+    return write_module("cached_services", MODULE)
+
+
+def test_registry_cache(module: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Signatures saved by a first `App` are loaded by the next ones, instead of being reflected again.
+    """
+
+    import cached_services as services  # type: ignore[import-not-found]
+
+    path = tmp_path / "registry.cache"
+    options: list[Option] = [Provider(services.config), Provider(services.database), Consumer(services.check)]
+    App(*options, registry_cache=path).run()
+    assert path.exists()
+
+    # A new process: nothing is reflected anymore.
+    signature_cache.clear()
+    reflect = inspect.signature
+
+    def forbidden(obj: object) -> inspect.Signature:
+        raise AssertionError(f"{obj} was reflected")
+
+    monkeypatch.setattr(inspect, "signature", forbidden)
+    App(*options, registry_cache=path).run()
+    assert RegistryCache(path).preload(services.database)
+
+    # Once the module changes, its signatures are reflected again.
+    monkeypatch.setattr(inspect, "signature", reflect)
+    stat = module.stat()
+    os.utime(module, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    cache = RegistryCache(path)
+    assert not cache.preload(services.database)
+
+
+def test_corrupted_cache(tmp_path: Path) -> None:
+    path = tmp_path / "registry.cache"
+    _ = path.write_bytes(b"garbage")
+    cache = RegistryCache(path)
+    assert not cache.preload(print)
+
+
+def test_cached_defaults(module: Path, tmp_path: Path) -> None:
+    """
+    Default values are taken from the callable itself, not from the cache, so consumers receive the same objects.
+    """
+
+    import cached_services as services  # type: ignore[import-not-found]
+
+    path = tmp_path / "registry.cache"
+    App(Consumer(services.configure), registry_cache=path).run()
+    signature_cache.clear()
+    cache = RegistryCache(path)
+    App(Consumer(services.configure), registry_cache=path).run()
+    assert cache.preload(services.configure)
+    assert services.received == [services.DEFAULT_OPTIONS, services.DEFAULT_OPTIONS]
+    assert all(options is services.DEFAULT_OPTIONS for options in services.received)
+
+
+def test_cached_aliases(
+    write_module: Callable[[str, str], Path], tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """
+    Signatures are reflected again when an alias they use changes, even if it is defined in another module.
+    """
+
+    _ = write_module("cached_aliases", 'from typing import Annotated\n\nName = Annotated[str, "first"]\n')
+    source = "from cached_aliases import Name\n\nreceived: list[str] = []\n\n\ndef greet(name: Name) -> None:\n"
+    _ = write_module("cached_greetings", source + "    received.append(name)\n")
+
+    def run() -> list[str]:
+        import cached_greetings as greetings  # type: ignore[import-not-found]
+
+        App(
+            Supplier("Cylix", regard=Annotated[str, "first"]),
+            Supplier("Lee", regard=Annotated[str, "second"]),
+            Consumer(greetings.greet),
+            registry_cache=path,
+        ).run()
+        return list(greetings.received)
+
+    path = tmp_path / "registry.cache"
+    assert run() == ["Cylix"]
+    _ = write_module("cached_aliases", 'from typing import Annotated\n\nName = Annotated[str, "second"]\n')
+    monkeypatch.delitem(sys.modules, "cached_greetings")  # reimported, but unchanged
+    signature_cache.clear()
+    assert run() == ["Lee"]
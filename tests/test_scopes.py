@@ -0,0 +1,81 @@
+import asyncio
+from dataclasses import dataclass
+
+import pytest
+
+from injectionkit import App, AsyncApp, Lifetime, MissingDependencyError, Provider, Supplier
+
+
+@dataclass(frozen=True)
+class Request(object):
+    path: str
+
+
+@dataclass(frozen=True)
+class Pool(object):
+    pass
+
+
+@dataclass(frozen=True)
+class Session(object):
+    pool: Pool
+
+
+@dataclass(frozen=True)
+class Handler(object):
+    request: Request
+    session: Session
+
+
+def test_scope() -> None:
+    """
+    Options registered into a scope are only visible inside it, while the options of the application are shared.
+    """
+
+    app = App(Provider(Pool, singleton=True), Provider(Session, lifetime=Lifetime.scoped), Provider(Handler))
+    first, second = app.scope(Supplier(Request("/first"))), app.scope(Supplier(Request("/second")))
+
+    handler = first.resolve(Handler)
+    assert isinstance(handler, Handler)
+    assert handler.request.path == "/first"
+    assert handler.session is first.resolve(Session)
+    assert handler.session is not second.resolve(Session)
+    assert handler.session.pool is second.resolve(Pool) is app.resolve(Pool)
+
+    with pytest.raises(MissingDependencyError):
+        _ = app.resolve(Handler)
+
+
+def test_entered_scope() -> None:
+    """
+    While a scope is entered, `resolve` goes through it.
+    """
+
+    app = App(Provider(Pool), Provider(Session, lifetime=Lifetime.scoped), Provider(Handler))
+    with app.scope(Supplier(Request("/"))) as scope:
+        handler = app.resolve(Handler)
+        assert isinstance(handler, Handler)
+        assert handler.request.path == "/"
+        assert handler.session is scope.resolve(Session)
+    with pytest.raises(MissingDependencyError):
+        _ = app.resolve(Handler)
+
+
+def test_task_scopes() -> None:
+    """
+    Scopes entered in concurrent asyncio tasks don't interfere.
+    """
+
+    app = AsyncApp(Provider(Pool), Provider(Handler), Provider(Session))
+
+    async def handle(path: str) -> str:
+        with app.scope(Supplier(Request(path))):
+            await asyncio.sleep(0)
+            handler = await app.resolve(Handler)
+            assert isinstance(handler, Handler)
+            return handler.request.path
+
+    async def main() -> list[str]:
+        return await asyncio.gather(*(handle(f"/{index}") for index in range(10)))
+
+    assert asyncio.run(main()) == [f"/{index}" for index in range(10)]
@@ -0,0 +1,73 @@
+import asyncio
+from collections.abc import AsyncIterator, Iterable, Iterator
+from typing import Annotated
+
+import pytest
+
+from injectionkit import App, AsyncApp, Consumer, MissingDependencyError, Provider, Supplier
+
+
+class Plugin(object):
+    name: str
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+
+def test_stream() -> None:
+    """
+    `Iterator[T]` parameters receive a generator building the candidates of `T` one at a time, so the candidates after
+    the one the consumer stops at are never built.
+    """
+
+    built: list[str] = []
+
+    def first() -> Plugin:
+        built.append("first")
+        return Plugin("first")
+
+    def second() -> Plugin:
+        built.append("second")
+        return Plugin("second")
+
+    def check(plugins: Iterator[Plugin]) -> None:
+        assert built == []
+        assert next(plugin for plugin in plugins if plugin.name == "first").name == "first"
+
+    App(Provider(first), Provider(second), Consumer(check)).run()
+    assert built == ["first"]
+
+
+def test_stream_labels() -> None:
+    """
+    Labels filter the streamed candidates, which come in the order a `list[T]` would hold them: supplied instances
+    first, then providers, in registration order.
+    """
+
+    def check(plugins: Annotated[Iterable[Plugin], "enabled"]) -> None:
+        assert [plugin.name for plugin in plugins] == ["supplied", "provided"]
+
+    App(
+        Provider(lambda: Plugin("provided"), regard=Annotated[Plugin, "enabled"]),
+        Provider(lambda: Plugin("disabled"), regard=Plugin),
+        Supplier(Plugin("supplied"), regard=Annotated[Plugin, "enabled"]),
+        Consumer(check),
+    ).run()
+
+    with pytest.raises(MissingDependencyError):
+        App(Consumer(check)).run()
+
+
+def test_async_stream() -> None:
+    built: list[str] = []
+
+    async def plugin() -> Plugin:
+        built.append("plugin")
+        return Plugin("plugin")
+
+    async def check(plugins: AsyncIterator[Plugin]) -> None:
+        assert built == []
+        assert [plugin.name async for plugin in plugins] == ["plugin"]
+
+    asyncio.run(AsyncApp(Provider(plugin), Consumer(check)).run())
+    assert built == ["plugin"]
@@ -0,0 +1,89 @@
+from abc import ABC, abstractmethod
+from typing import Annotated
+
+import pytest
+
+from injectionkit import App, DependencyContainer, MissingDependencyError, Provider, Supplier
+
+
+class Storage(ABC):
+    @abstractmethod
+    def read(self) -> str: ...
+
+
+class Disk(Storage):
+    def read(self) -> str:
+        return "disk"
+
+
+class Memory(object):
+    def read(self) -> str:
+        return "memory"
+
+
+_ = Storage.register(Memory)
+
+
+class LocalDisk(Disk):
+    pass
+
+
+def test_subtypes() -> None:
+    """
+    With `subtypes=True`, a base class without registrations of its own resolves to the registrations of its
+    subclasses, while exact registrations take precedence.
+    """
+
+    def disk() -> LocalDisk:
+        return LocalDisk()
+
+    app = App(Provider(disk), subtypes=True)
+    assert isinstance(app.resolve(Disk), LocalDisk)
+    assert isinstance(app.resolve(Storage), LocalDisk)
+
+    # Registering another subclass refreshes the memoized lookups.
+    app.add(Supplier(Disk()))
+    assert type(app.resolve(Disk)) is Disk
+    storages = app.resolve(list[Storage])
+    assert isinstance(storages, list)
+    assert [type(storage) for storage in storages] == [Disk, LocalDisk]
+
+    with pytest.raises(MissingDependencyError):
+        App(Provider(disk)).resolve(Disk)
+
+
+def test_virtual_subclasses() -> None:
+    """
+    Classes registered into an ABC with `ABC.register` count as subclasses, with labels still applying.
+    """
+
+    container = DependencyContainer(subtypes=True)
+    container.register(Supplier(Memory(), regard=Annotated[Memory, "cache"]))
+    storage = container.resolve(Annotated[Storage, "cache"])
+    assert isinstance(storage, Memory)
+
+    # A scope sees its own subclasses too.
+    scope = container.child()
+    scope.register(Supplier(LocalDisk(), regard=Annotated[LocalDisk, "cache"]))
+    storages = scope.resolve(Annotated[list[Storage], "cache"])
+    assert isinstance(storages, list)
+    assert [type(storage) for storage in storages] == [Memory, LocalDisk]
+    assert isinstance(container.resolve(Annotated[Storage, "cache"]), Memory)
+
+
+def test_late_virtual_subclasses() -> None:
+    """
+    A class registered into an ABC after a failed resolution of the ABC is found by the next resolutions.
+    """
+
+    class Cache(ABC):
+        pass
+
+    class Redis(object):
+        pass
+
+    app = App(Supplier(Redis()), subtypes=True)
+    with pytest.raises(MissingDependencyError):
+        _ = app.resolve(Cache)
+    _ = Cache.register(Redis)
+    assert isinstance(app.resolve(Cache), Redis)
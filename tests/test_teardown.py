@@ -0,0 +1,272 @@
+import asyncio
+import threading
+from collections.abc import AsyncIterator, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+import pytest
+
+from injectionkit import App, AsyncApp, Consumer, DependencyContainer, Lifetime, Provider, ScopeRequiredError, Supplier
+
+
+@dataclass(frozen=True)
+class Config(object):
+    url: str
+
+
+@dataclass(frozen=True)
+class Database(object):
+    config: Config
+
+
+@dataclass(frozen=True)
+class Cache(object):
+    config: Config
+
+
+@dataclass(frozen=True)
+class Service(object):
+    database: Database
+    cache: Cache
+
+
+def test_reverse_order() -> None:
+    """
+    Generator and context manager providers are torn down on `close`, each before the instances it was built from.
+    """
+
+    log: list[str] = []
+
+    def config() -> Iterator[Config]:
+        log.append("open config")
+        yield Config("sqlite://")
+        log.append("close config")
+
+    @contextmanager
+    def database(config: Config) -> Iterator[Database]:
+        log.append("open database")
+        yield Database(config)
+        log.append("close database")
+
+    def service(database: Database) -> Iterator[str]:
+        yield f"service of {database.config.url}"
+        log.append("close service")
+
+    with App(Provider(config, singleton=True), Provider(database, singleton=True), Provider(service)) as app:
+        with app.scope():
+            assert app.resolve(str) == "service of sqlite://"
+        assert app.resolve(Database) == Database(Config("sqlite://"))
+        assert log == ["open config", "open database", "close service"]
+    assert log == ["open config", "open database", "close service", "close database", "close config"]
+
+
+def test_parallel_teardown() -> None:
+    """
+    With an executor, independent branches are torn down concurrently, after their dependents and before their
+    dependencies.
+    """
+
+    log: list[str] = []
+    barrier = threading.Barrier(2, timeout=5)
+
+    def config() -> Iterator[Config]:
+        yield Config("sqlite://")
+        log.append("config")
+
+    def database(config: Config) -> Iterator[Database]:
+        yield Database(config)
+        _ = barrier.wait()  # only returns if the cache is torn down at the same time
+        log.append("database")
+
+    def cache(config: Config) -> Iterator[Cache]:
+        yield Cache(config)
+        _ = barrier.wait()
+        log.append("cache")
+
+    def service(database: Database, cache: Cache) -> Iterator[Service]:
+        yield Service(database, cache)
+        log.append("service")
+
+    with ThreadPoolExecutor(4) as executor:
+        app = App(
+            Provider(config, singleton=True),
+            Provider(database, singleton=True),
+            Provider(cache, singleton=True),
+            Provider(service, singleton=True),
+            executor=executor,
+        )
+        _ = app.resolve(Service)
+        app.close()
+    assert log[0] == "service"
+    assert set(log[1:3]) == {"database", "cache"}
+    assert log[3] == "config"
+
+
+def test_executor_shut_down() -> None:
+    """
+    Once the executor is shut down, instances are still torn down, on the closing thread.
+    """
+
+    log: list[str] = []
+
+    def config() -> Iterator[Config]:
+        yield Config("sqlite://")
+        log.append("config")
+
+    def database(config: Config) -> Iterator[Database]:
+        yield Database(config)
+        log.append("database")
+
+    with ThreadPoolExecutor(2) as executor:
+        app = App(Provider(config, singleton=True), Provider(database, singleton=True), executor=executor)
+        _ = app.resolve(Database)
+    app.close()
+    assert log == ["database", "config"]
+
+
+def test_scope_exit() -> None:
+    """
+    Leaving a scope tears down its scoped and transient instances, while singletons live until the application closes.
+    """
+
+    log: list[str] = []
+
+    def config() -> Iterator[Config]:
+        yield Config("sqlite://")
+        log.append("config")
+
+    def database(config: Config) -> Iterator[Database]:
+        yield Database(config)
+        log.append("database")
+
+    app = App(Provider(config, singleton=True), Provider(database, lifetime=Lifetime.scoped))
+    with app.scope():
+        _ = app.resolve(Database)
+    assert log == ["database"]
+    app.close()
+    assert log == ["database", "config"]
+
+
+def test_async_teardown() -> None:
+    log: list[str] = []
+
+    async def database(config: Config) -> AsyncIterator[Database]:
+        yield Database(config)
+        await asyncio.sleep(0)
+        log.append("database")
+
+    async def cache(config: Config) -> AsyncIterator[Cache]:
+        yield Cache(config)
+        log.append("cache")
+
+    def service(database: Database, cache: Cache) -> Iterator[Service]:
+        yield Service(database, cache)
+        log.append("service")
+
+    async def main() -> None:
+        async with AsyncApp(
+            Supplier(Config("sqlite://")),
+            Provider(database, singleton=True),
+            Provider(cache, singleton=True),
+            Provider(service, lifetime=Lifetime.scoped),
+        ) as app:
+            _ = await app.resolve(Service)
+
+    asyncio.run(main())
+    assert log[0] == "service"
+    assert set(log[1:]) == {"database", "cache"}
+
+
+def test_teardown_errors() -> None:
+    """
+    Every instance is torn down even when a teardown fails; the first error is raised afterwards.
+    """
+
+    log: list[str] = []
+
+    def config() -> Iterator[Config]:
+        yield Config("sqlite://")
+        log.append("config")
+
+    def database(config: Config) -> Iterator[Database]:
+        yield Database(config)
+        raise RuntimeError("database")
+
+    container = DependencyContainer()
+    container.register(Provider(config, singleton=True))
+    container.register(Provider(database, singleton=True))
+    _ = container.resolve(Database)
+    with pytest.raises(RuntimeError, match="database"):
+        container.close()
+    assert log == ["config"]
+
+
+def test_lifetimes_order() -> None:
+    """
+    A singleton built from a transient managed instance is torn down first, although their lifetimes differ.
+    """
+
+    log: list[str] = []
+
+    def config() -> Iterator[Config]:
+        yield Config("sqlite://")
+        log.append("close config")
+
+    def database(config: Config) -> Iterator[Database]:
+        yield Database(config)
+        log.append("close database")
+
+    container = DependencyContainer()
+    container.register(Provider(config))
+    container.register(Provider(database, singleton=True))
+    _ = container.resolve(Database)
+    container.close()
+    assert log == ["close database", "close config"]
+
+
+def test_unscoped_transients() -> None:
+    """
+    Managed transient instances are torn down with their scope. Outside of any scope, resolving them raises, instead of
+    keeping every instance until the application closes.
+    """
+
+    log: list[str] = []
+
+    def database(config: Config) -> Iterator[Database]:
+        yield Database(config)
+        log.append("database")
+
+    app = App(Supplier(Config("sqlite://")), Provider(database))
+    with pytest.raises(ScopeRequiredError):
+        _ = app.resolve(Database)
+    for count in range(1, 101):
+        with app.scope():
+            _ = app.resolve(Database)
+        assert len(log) == count
+
+    async def main() -> None:
+        with pytest.raises(ScopeRequiredError):
+            _ = await AsyncApp(Supplier(Config("sqlite://")), Provider(database)).resolve(Database)
+
+    asyncio.run(main())
+
+
+def test_consumer_transients() -> None:
+    """
+    Transient instances built for consumers are torn down when the application closes, without requiring a scope.
+    """
+
+    log: list[str] = []
+
+    def database(config: Config) -> Iterator[Database]:
+        yield Database(config)
+        log.append("close database")
+
+    def use(database: Database) -> None:
+        log.append(f"use {database.config.url}")
+
+    with App(Supplier(Config("sqlite://")), Provider(database), Consumer(use)) as app:
+        app.run()
+        assert log == ["use sqlite://"]
+    assert log == ["use sqlite://", "close database"]
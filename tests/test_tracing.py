@@ -0,0 +1,112 @@
+import asyncio
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Annotated
+
+from injectionkit import (
+    App,
+    AsyncApp,
+    ChromeTraceExporter,
+    Consumer,
+    Provider,
+    Supplier,
+    TraceEvent,
+    TraceKind,
+    TracePhase,
+)
+
+
+@dataclass(frozen=True)
+class Config(object):
+    url: str
+
+
+@dataclass(frozen=True)
+class Database(object):
+    config: Config
+
+
+def database(config: Config) -> Database:
+    return Database(config)
+
+
+def test_events() -> None:
+    """
+    Hooks receive a begin and an end event for every reflection, provider call and consumer call, with the concrete
+    type and labels of providers and their depth in the dependency graph.
+    """
+
+    events: list[TraceEvent] = []
+
+    def config(url: Annotated[str, "url"]) -> Annotated[Config, "primary"]:
+        return Config(url)
+
+    def primary(config: Annotated[Config, "primary"]) -> Database:
+        return Database(config)
+
+    def check(database: Database) -> None:
+        pass
+
+    app = App(
+        Supplier("sqlite://", regard=Annotated[str, "url"]),
+        Provider(config),
+        Provider(primary),
+        Consumer(check),
+        hooks=[events.append],
+    )
+    app.run()
+
+    begins = [event for event in events if event.phase is TracePhase.begin]
+    ends = {event.span for event in events if event.phase is TracePhase.end}
+    assert {event.span for event in begins} == ends
+    provided = [(event.name, event.depth, event.labels) for event in begins if event.kind is TraceKind.provide]
+    # Dependencies are built first.
+    assert provided == [
+        ("test_events.<locals>.config", 2, frozenset({"primary"})),
+        ("test_events.<locals>.primary", 1, frozenset()),
+    ]
+    consumed = [event.name for event in begins if event.kind is TraceKind.consume]
+    assert consumed == ["test_events.<locals>.check"]
+    reflected = {event.name for event in begins if event.kind is TraceKind.reflect}
+    assert {"test_events.<locals>.primary", "test_events.<locals>.check"} <= reflected
+
+    # Without hooks, nothing is traced.
+    count = len(events)
+    app.remove_hook(events.append)
+    app.run()
+    assert len(events) == count
+
+
+def test_chrome_trace(tmp_path: Path) -> None:
+    """
+    `ChromeTraceExporter` writes the spans in the Chrome trace event format, loadable in Perfetto.
+    """
+
+    exporter = ChromeTraceExporter()
+    app = App(Supplier(Config("sqlite://")), Provider(database), hooks=[exporter])
+    _ = app.resolve(Database)
+
+    path = tmp_path / "trace.json"
+    exporter.write(path)
+    trace = json.loads(path.read_text())
+    (span,) = [event for event in trace["traceEvents"] if event["cat"] == "provide"]
+    assert span["name"] == "database"
+    assert span["ph"] == "X"
+    assert span["dur"] >= 0
+    assert span["args"] == {"depth": 1, "type": "Database"}
+
+
+def test_async_events() -> None:
+    events: list[TraceEvent] = []
+
+    async def config() -> Config:
+        return Config("sqlite://")
+
+    async def check(database: Database) -> None:
+        pass
+
+    asyncio.run(AsyncApp(Provider(config), Provider(database), Consumer(check), hooks=[events.append]).run())
+    provided = {(event.name, event.depth) for event in events if event.kind is TraceKind.provide}
+    assert provided == {("test_async_events.<locals>.config", 2), ("database", 1)}
+    assert [event.phase for event in events if event.kind is TraceKind.consume] == [TracePhase.begin, TracePhase.end]
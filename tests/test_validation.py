@@ -0,0 +1,111 @@
+import asyncio
+from dataclasses import dataclass
+
+import pytest
+
+from injectionkit import (
+    App,
+    AsyncApp,
+    CircularDependencyError,
+    Consumer,
+    InvalidProviderFactoryError,
+    MissingDependencyError,
+    Provider,
+    Supplier,
+)
+
+
+@dataclass(frozen=True)
+class Config(object):
+    name: str
+
+
+@dataclass(frozen=True)
+class Database(object):
+    config: Config
+
+
+@dataclass(frozen=True)
+class Service(object):
+    database: Database
+    config: Config
+
+
+def test_build_order() -> None:
+    """
+    `App.validate()` checks the whole graph without building anything, and returns the providers in build order.
+    """
+
+    def check(service: Service) -> None:
+        raise AssertionError("consumers are not run by validation")
+
+    app = App(Provider(Service), Provider(Database), Provider(Config, singleton=True), Supplier("app"), Consumer(check))
+    assert app.validate() == [Provider(Config, singleton=True), Provider(Database), Provider(Service)]
+
+
+def test_missing() -> None:
+    # Nothing provides `Config`, which is only noticed when the `Database` is requested... unless we validate.
+    with pytest.raises(MissingDependencyError):
+        _ = App(Provider(Database), validate=True)
+
+
+def test_invalid_factory() -> None:
+    with pytest.raises(InvalidProviderFactoryError):
+        _ = App(Provider("not callable", regard=Config), validate=True)
+
+
+def test_cycle() -> None:
+    def config(service: Service) -> Config:
+        return service.config
+
+    with pytest.raises(CircularDependencyError) as error:
+        _ = App(Provider(config), Provider(Database), Provider(Service), validate=True)
+    assert [provider.factory for provider in error.value.path] == [config, Service, Database, config]
+
+
+def test_deep_chain() -> None:
+    """
+    Resolution runs in one pass over the topologically ordered graph, so long chains don't exhaust the stack.
+    """
+
+    types: list[type] = [int]
+    options: list[Provider] = []
+    for depth in range(2000):
+
+        def factory(value: object) -> object:
+            return value
+
+        factory.__annotations__ = {"value": types[-1], "return": type(f"T{depth}", (), {})}
+        types.append(factory.__annotations__["return"])
+        options.append(Provider(factory))
+    assert App(Supplier(42), *options).resolve(types[-1]) == 42
+
+
+def test_provider_defaults() -> None:
+    """
+    A provider parameter without candidates takes its default value, like a consumer parameter.
+    """
+
+    def greeting(count: int = 3) -> str:
+        return "hi" * count
+
+    greetings: list[str] = []
+
+    def use(greeting: str) -> None:
+        greetings.append(greeting)
+
+    App(Provider(greeting), Consumer(use)).run()
+    assert greetings == ["hihihi"]
+
+
+def test_async_cycle() -> None:
+    """
+    The asynchronous resolution raises on cycles too, instead of walking them forever.
+    """
+
+    def config(service: Service) -> Config:
+        return service.config
+
+    app = AsyncApp(Provider(config), Provider(Database), Provider(Service, singleton=True))
+    with pytest.raises(CircularDependencyError):
+        _ = asyncio.run(app.resolve(Service))
@@ -0,0 +1,104 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+import pytest
+
+from injectionkit import App, Provider, Supplier
+
+
+@dataclass(frozen=True)
+class Config(object):
+    url: str
+
+
+@dataclass(frozen=True)
+class Database(object):
+    config: Config
+
+
+@dataclass(frozen=True)
+class Cache(object):
+    config: Config
+
+
+def test_background_warmup() -> None:
+    """
+    Singletons are built in the background, each after its dependencies, and resolved afterwards without being rebuilt.
+    """
+
+    log: list[str] = []
+
+    def config() -> Config:
+        log.append("config")
+        return Config("sqlite://")
+
+    def database(config: Config) -> Database:
+        log.append("database")
+        return Database(config)
+
+    def cache(config: Config) -> Cache:
+        log.append("cache")
+        return Cache(config)
+
+    app = App(Provider(database, singleton=True), Provider(cache, singleton=True), Provider(config, singleton=True))
+    ready = app.start_warmup()
+    assert ready.result(timeout=5) is None
+    assert log[0] == "config"
+    assert sorted(log[1:]) == ["cache", "database"]
+    assert app.resolve(Database) == Database(Config("sqlite://"))
+    assert len(log) == 3
+
+
+def test_resolve_during_warmup() -> None:
+    """
+    Resolutions only wait for the singleton being built by the warm-up, not for the warm-up to complete.
+    """
+
+    building = threading.Event()
+    release = threading.Event()
+
+    def database(config: Config) -> Database:
+        building.set()
+        assert release.wait(timeout=5)
+        return Database(config)
+
+    app = App(Supplier(Config("sqlite://")), Provider(database, singleton=True), Provider(Cache, singleton=True))
+    ready = app.start_warmup(Database)
+    assert building.wait(timeout=5)
+    assert app.resolve(Cache) == Cache(Config("sqlite://"))  # not blocked by the database being built
+    assert not ready.done()
+
+    with ThreadPoolExecutor(1) as executor:
+        pending = executor.submit(app.resolve, Database)
+        assert not pending.done()
+        release.set()
+        database_instance = pending.result(timeout=5)
+    assert ready.result(timeout=5) is None
+    assert app.resolve(Database) is database_instance
+
+
+def test_selected_warmup() -> None:
+    log: list[str] = []
+
+    def database(config: Config) -> Database:
+        log.append("database")
+        return Database(config)
+
+    def cache(config: Config) -> Cache:
+        log.append("cache")
+        return Cache(config)
+
+    app = App(Supplier(Config("sqlite://")), Provider(database, singleton=True), Provider(cache, singleton=True))
+    with ThreadPoolExecutor(1) as executor:
+        app.start_warmup(Cache, executor=executor).result(timeout=5)
+    assert log == ["cache"]
+
+
+def test_warmup_error() -> None:
+    def database(config: Config) -> Database:
+        raise RuntimeError("unreachable database")
+
+    app = App(Supplier(Config("sqlite://")), Provider(database, singleton=True))
+    with pytest.raises(RuntimeError, match="unreachable database"):
+        app.start_warmup().result(timeout=5)